@@ -1,5 +1,6 @@
+from . import startup  # first, so the startup clock includes every other import
 from flask import Blueprint
 
 api_blueprint = Blueprint('api', __name__)
 
-from . import routes
\ No newline at end of file
+from . import routes
@@ -0,0 +1,62 @@
+import os
+import pickle
+import threading
+import time
+
+from api import startup
+
+
+class ModelLoader:
+    """
+    Loads the serving model on a background thread so the service can answer health checks
+    (and report that it isn't ready yet) while the model is still being loaded. The model is
+    either a pickled MCCFR model or a quantized strategy artifact (.npz).
+    """
+    def __init__(self, path):
+        self.path = path
+        self.model = None
+        self.error = None
+        self._thread = None
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name="model-loader", daemon=True)
+                self._thread.start()
+        return self
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            if self.path.endswith('.npz'):
+                # Quantized strategy artifact from src/export.py
+                from src.export import QuantizedStrategy
+                self.model = QuantizedStrategy.load(self.path)
+            else:
+                with open(self.path, 'rb') as f:
+                    self.model = pickle.load(f)
+        except FileNotFoundError:
+            self.error = f"Model file {self.path} not found."
+            print(f"Warning: {self.error}")
+        except Exception as e:
+            self.error = f"Could not load model {self.path}: {e}"
+            print(f"Warning: {self.error}")
+        else:
+            startup.mark('model_load', time.perf_counter() - start)
+            startup.mark('ready_since_start', startup.since_start())
+        finally:
+            self._loaded.set()
+
+    @property
+    def ready(self) -> bool:
+        return self.model is not None
+
+    def wait(self, timeout=None) -> bool:
+        self.start()
+        self._loaded.wait(timeout)
+        return self.ready
+
+
+model_loader = ModelLoader(os.environ.get('MODEL_PATH', 'mccfr_model'))
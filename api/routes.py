@@ -1,16 +1,6 @@
 from flask import request, jsonify
 from api import api_blueprint
-from src.mccfr import MCCFR
-import pickle
-import os
-
-model_path = "mccfr_model"
-
-try:
-    with open(model_path, 'rb') as f:
-        mccfr_model: MCCFR = pickle.load(f)
-except FileNotFoundError:
-    print(f"Warning: Model file {model_path} not found.")
+from api.model_loader import model_loader
 
 
 @api_blueprint.route('/choose_move', methods=['POST'])
@@ -18,15 +8,21 @@ def choose_move():
     data = request.json
     
     infoset_key = data.get('infoset_key')
+    # Optional for models that store each infoset's valid actions, required for DeepMCCFR
+    valid_action_indices = data.get('valid_action_indices')
     
     if not infoset_key:
         return jsonify({'error': 'Missing required game state information'}), 400
+
+    mccfr_model = model_loader.model
+    if mccfr_model is None:
+        return jsonify({'error': model_loader.error or 'Model is still loading.'}), 503
     
     try:
-        move = mccfr_model.choose_move(infoset_key)
+        move = mccfr_model.choose_move(infoset_key, valid_action_indices)
     except:
         return jsonify({'error': "Invalid infoset provided."}), 400
     
     return jsonify({
         'action': move,
-    })
\ No newline at end of file
+    })
@@ -0,0 +1,18 @@
+"""
+Startup-time instrumentation: how long the service spends importing, loading the model and
+answering its first request. Import this module first so its clock starts as early as possible.
+"""
+import time
+
+STARTED = time.perf_counter()
+
+timings = {}
+
+
+def mark(name: str, seconds: float):
+    timings[name] = round(seconds, 4)
+    print(f"[startup] {name}: {seconds * 1000:.1f} ms")
+
+
+def since_start() -> float:
+    return time.perf_counter() - STARTED
@@ -1,6 +1,11 @@
-from flask import Flask
+from api import startup
+from flask import Flask, g, request
 from flask_cors import CORS
 from api.routes import api_blueprint
+from api.model_loader import model_loader
+import time
+
+startup.mark('import', startup.since_start())
 
 def create_app():
     app = Flask(__name__)
@@ -8,10 +13,35 @@ def create_app():
     CORS(app)
     
     app.register_blueprint(api_blueprint, url_prefix='/api')
+
+    # Unpickle the model in the background; health checks are answered while it loads
+    model_loader.start()
+
+    first_request = {'pending': True}
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_first_request(response):
+        if first_request['pending'] and request.path.startswith('/api/') and response.status_code == 200:
+            first_request['pending'] = False
+            startup.mark('first_request', time.perf_counter() - g.request_started)
+            startup.mark('first_request_since_start', startup.since_start())
+        return response
     
     @app.route('/')
     def health_check():
-        return {'status': 'healthy'}, 200
+        # Liveness: answers as soon as the process is up, whether or not the model is loaded
+        return {'status': 'healthy', 'ready': model_loader.ready}, 200
+
+    @app.route('/ready')
+    def readiness_check():
+        body = {'ready': model_loader.ready, 'startup': startup.timings}
+        if model_loader.error:
+            body['error'] = model_loader.error
+        return body, 200 if model_loader.ready else 503
     
     return app
 
@@ -19,4 +49,4 @@ app = create_app()
 
 if __name__ == '__main__':
     app = create_app()
-    app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5001, debug=True)
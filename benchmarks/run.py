@@ -0,0 +1,338 @@
+"""
+Hot-path benchmarks with baseline regression tracking.
+
+Metrics are throughputs (operations per second, higher is better) or latencies (microseconds
+per call, lower is better). Results are written as JSON; when a baseline exists, any metric
+more than `--threshold` slower than it fails the run.
+
+Raw timings on a shared machine drift with other load: reruns of unchanged code moved them
+by up to 80%. Every sample is therefore bracketed by a fixed pure-Python calibration loop,
+and the regression check compares the median of the samples relative to it (operations per
+calibration loop), which moves with the machine's speed. With gc disabled while sampling, as
+timeit does, four reruns on a busy single-core machine stayed within 17% of the baseline,
+so the default threshold is 20%. api_choose_move, which goes through Flask, came within 20%
+and has its own threshold of 30%.
+
+Usage (from the repository root):
+    python -m benchmarks.run --save-baseline          # record benchmarks/baseline.json
+    python -m benchmarks.run                          # compare against it
+    python -m benchmarks.run --only train --threshold 0.1 --out results.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from src.deck import Deck, PocketPokerDeck
+from src.game_v2 import SimpleGame, PocketPoker, KuhnPoker
+from src.mccfr import MCCFR, Infoset
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+BENCHMARKS = {}
+
+
+UNITS = {'ops/s': 'higher', 'us': 'lower'}
+
+
+THRESHOLDS = {}
+
+
+def benchmark(name, unit='ops/s', threshold=None):
+    """
+    Registers a benchmark. `threshold` overrides --threshold for metrics known to be noisier.
+    """
+    def register(func):
+        BENCHMARKS[name] = (func, unit)
+        if threshold is not None:
+            THRESHOLDS[name] = threshold
+        return func
+    return register
+
+
+def calibrate():
+    total = 0
+    for i in range(20000):
+        total += i * i % 7
+    return total
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def sample(func, min_time, repeats):
+    """
+    Takes `repeats` samples of `func(min_time)` with gc disabled, timing the calibration loop
+    before and after each. Returns (value, calibration seconds) pairs.
+    """
+    samples = []
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            before = timed(calibrate)
+            value = func(min_time)
+            calibration = (before + timed(calibrate)) / 2
+            samples.append((value, calibration))
+    finally:
+        gc.enable()
+    return samples
+
+
+def measure(func, ops_per_call=1, min_time=0.2, repeats=9):
+    """
+    Median throughput of `func` over `repeats` samples, each calling it for at least `min_time`
+    seconds, and the median throughput per calibration loop.
+    """
+    def once(min_time):
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+        return calls * ops_per_call / elapsed
+
+    samples = sample(once, min_time, repeats)
+    return (
+        statistics.median(value for value, _ in samples),
+        statistics.median(value * calibration for value, calibration in samples),
+    )
+
+
+def measure_latency(func, min_time=0.2, repeats=9):
+    """
+    Median latency of a single call to `func` in microseconds, and the median latency in
+    calibration loops.
+    """
+    def once(min_time):
+        latencies = []
+        clock = time.perf_counter
+        end = clock() + min_time
+        while True:
+            start = clock()
+            func()
+            stop = clock()
+            latencies.append(stop - start)
+            if stop >= end:
+                return statistics.median(latencies)
+
+    samples = sample(once, min_time, repeats)
+    return (
+        statistics.median(value for value, _ in samples) * 1e6,
+        statistics.median(value / calibration for value, calibration in samples),
+    )
+
+
+def quietly(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def trained_model(game_class, iterations):
+    model = MCCFR(game_class, 4)
+    quietly(model.train, iterations)
+    return model
+
+
+@benchmark('deck_setup_deal')
+def bench_deck_setup_deal(min_time):
+    deck = PocketPokerDeck(seed=0)
+
+    def run():
+        deck.reset()
+        deck.shuffle()
+        deck.draw(5)
+
+    return measure(run, min_time=min_time)
+
+
+@benchmark('deck_deal_batch')
+def bench_deck_deal_batch(min_time):
+    deck = Deck(seed=0)
+    return measure(lambda: deck.deal_batch(4096, 9), ops_per_call=4096, min_time=min_time)
+
+
+@benchmark('get_infoset_key')
+def bench_get_infoset_key(min_time):
+    game = PocketPoker(seed=0)
+    game.setup()
+    history = [1, 3]
+    return measure(lambda: game.get_infoset_key(0, history), min_time=min_time)
+
+
+@benchmark('get_strategy')
+def bench_get_strategy(min_time):
+    infoset = Infoset(4, [1, 3])
+    infoset.regret_sum[:] = [0.0, 4.9, 0.0, -1.2]
+    return measure(infoset.get_strategy, min_time=min_time)
+
+
+@benchmark('pocket_evaluate')
+def bench_pocket_evaluate(min_time):
+    game = PocketPoker(seed=0)
+    game.setup()
+    return measure(lambda: game.evaluate(game.player1_cards, game.community_cards), min_time=min_time)
+
+
+@benchmark('pocket_showdown')
+def bench_pocket_showdown(min_time):
+    game = PocketPoker(seed=0)
+    game.setup()
+    return measure(lambda: game.showdown(0), min_time=min_time)
+
+
+def bench_train(game_class, iterations, min_time):
+    # train_iter rather than train, which would also time printing every infoset
+    def run():
+        for _ in MCCFR(game_class, 4).train_iter(iterations):
+            pass
+    return measure(run, ops_per_call=iterations, min_time=min_time)
+
+
+@benchmark('train_kuhn')
+def bench_train_kuhn(min_time):
+    return bench_train(KuhnPoker, 1000, min_time)
+
+
+@benchmark('train_pocket')
+def bench_train_pocket(min_time):
+    return bench_train(PocketPoker, 1000, min_time)
+
+
+@benchmark('train_simple')
+def bench_train_simple(min_time):
+    return bench_train(SimpleGame, 500, min_time)
+
+
+@benchmark('choose_move_latency', unit='us')
+def bench_choose_move_latency(min_time):
+    model = trained_model(PocketPoker, 2000)
+    keys = sorted(model.nodes)
+    i = 0
+
+    def run():
+        nonlocal i
+        model.choose_move(keys[i % len(keys)])
+        i += 1
+
+    return measure_latency(run, min_time=min_time)
+
+
+@benchmark('api_choose_move', threshold=0.3)
+def bench_api_choose_move(min_time):
+    from app import create_app
+    from api.model_loader import model_loader
+
+    client = create_app().test_client()
+    if not model_loader.wait(timeout=60):
+        raise RuntimeError(model_loader.error or "Model did not load.")
+    payload = {'infoset_key': 'JA|T|'}
+
+    def run():
+        response = client.post('/api/choose_move', json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(f"/api/choose_move returned {response.status_code}")
+
+    return measure(run, min_time=min_time)
+
+
+def run_benchmarks(names, min_time):
+    """
+    Returns the raw metrics and the normalized metrics (relative to the calibration loop).
+    """
+    results = {}
+    normalized = {}
+    for name in names:
+        func, unit = BENCHMARKS[name]
+        results[name], normalized[name] = func(min_time)
+        print(f"{name:<20} {results[name]:>14,.1f} {unit}")
+    return results, normalized
+
+
+def compare(normalized, baseline, threshold):
+    """
+    Returns the metrics that got more than `threshold` (a fraction, or the metric's own
+    threshold) slower than the baseline, comparing normalized metrics.
+    """
+    regressions = []
+    for name, value in normalized.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        # Expressed as a change in speed, so both kinds of metric share the threshold
+        if UNITS[BENCHMARKS[name][1]] == 'higher':
+            change = value / base - 1
+        else:
+            change = base / value - 1
+        marker = ''
+        if change < -THRESHOLDS.get(name, threshold):
+            regressions.append(name)
+            marker = '  REGRESSION'
+        print(f"{name:<20} {base:>14,.4g} -> {value:>14,.4g} ({change:+.1%} speed){marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path benchmarks")
+    parser.add_argument('--only', nargs='*', help="Run benchmarks whose names contain any of these")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Seconds per sample")
+    parser.add_argument('--out', help="Write results JSON here")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown as a fraction")
+    args = parser.parse_args()
+
+    names = list(BENCHMARKS)
+    if args.only:
+        names = [name for name in names if any(part in name for part in args.only)]
+
+    results, normalized = run_benchmarks(names, args.min_time)
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'units': {name: BENCHMARKS[name][1] for name in names},
+        'metrics': results,
+        'normalized': normalized,
+    }
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f).get('normalized')
+    if baseline is None:
+        print(f"{args.baseline} has no normalized metrics; run with --save-baseline to recreate it.")
+        return 0
+
+    print(f"\nComparing normalized metrics against {args.baseline} (threshold {args.threshold:.0%})")
+    regressions = compare(normalized, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,9 @@
 from treys import Card
-from typing import List
-from random import Random
+from typing import List, Sequence, Tuple
+from itertools import combinations
+from math import comb, prod
+from .rng import DEALS, SHUFFLE, RandomStream
+import numpy as np
 
 STR_RANKS: str = '23456789TJQKA'
 STR_TOP_RANKS: str = 'TJQKA'
@@ -13,13 +16,14 @@ class Deck:
     
     def __init__(self, seed: int = None):
         self.seed = seed
-        self._random = Random(seed)
+        self._random = RandomStream(seed, domain=SHUFFLE)
         self.cards: List[Card] = []
         
         # Initialize standard 52 cards
         for rank in STR_RANKS:
             for suit in STR_SUITS:
                 self.cards.append(Card.new(rank + suit))
+        self._all_cards = tuple(self.cards)
     
     def shuffle(self) -> None:
         self._random.shuffle(self.cards)
@@ -31,7 +35,58 @@ class Deck:
         return cards
     
     def reset(self) -> None:
-        self.__init__(seed=self.seed)
+        """
+        Restores every card. A seeded deck also rewinds its stream, so it shuffles exactly like a
+        new Deck(seed); an unseeded one keeps drawing fresh randomness.
+        """
+        self.cards = list(self._all_cards)
+        if self.seed is not None:
+            self._random.rewind()
+
+    def deal_batch(self, n: int, cards_per_deal: int, stream: RandomStream = None) -> np.ndarray:
+        """
+        Returns an (n x cards_per_deal) array of deals from the cards in the deck, each row the
+        top of an independently shuffled deck, generated with one vectorized partial permutation.
+        """
+        generator = (stream or self._random).generator
+        cards = np.array(self.cards, dtype=np.int64)
+        keys = generator.random((n, len(cards)))
+
+        if cards_per_deal < len(cards):
+            idx = np.argpartition(keys, cards_per_deal - 1, axis=1)[:, :cards_per_deal]
+            order = np.take_along_axis(keys, idx, axis=1).argsort(axis=1)
+            idx = np.take_along_axis(idx, order, axis=1)
+        else:
+            idx = keys.argsort(axis=1)
+
+        return cards[idx]
+
+    def enumerate_deals(self, groups: Sequence[int], max_deals: int = 5_000_000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Every distinct deal from the cards in the deck, where `groups` gives the sizes of the
+        unordered card groups in a deal (e.g. (2, 2, 1) for two hands and a community card).
+        Returns the deals, laid out like `deal_batch` rows, and their probabilities.
+        """
+        total = prod(comb(len(self.cards) - sum(groups[:i]), size) for i, size in enumerate(groups))
+        if total > max_deals:
+            raise ValueError(f"{total} distinct deals is more than max_deals={max_deals}.")
+
+        deals = np.empty((total, sum(groups)), dtype=np.int64)
+        row = 0
+
+        def fill(remaining, prefix, group):
+            nonlocal row
+            if group == len(groups):
+                deals[row] = prefix
+                row += 1
+                return
+            for cards in combinations(remaining, groups[group]):
+                rest = [c for c in remaining if c not in cards]
+                fill(rest, prefix + list(cards), group + 1)
+
+        fill(list(self.cards), [], 0)
+        weights = np.full(total, 1.0 / total)
+        return deals, weights
 
     def __str__(self) -> str:
         return Card.ints_to_pretty_str(self.cards)
@@ -40,21 +95,60 @@ class Deck:
 class PocketPokerDeck(Deck):
     def __init__(self, seed = None):
         self.seed = seed
-        self._random = Random(seed)
+        self._random = RandomStream(seed, domain=SHUFFLE)
         self.cards: List[Card] = []
         
         # Initialize 20 card deck
         for rank in STR_TOP_RANKS:
             for suit in STR_SUITS:
                 self.cards.append(Card.new(rank + suit))
+        self._all_cards = tuple(self.cards)
 
 
 class KuhnPokerDeck(Deck):
     def __init__(self, seed = None):
         self.seed = seed
-        self._random = Random(seed)
+        self._random = RandomStream(seed, domain=SHUFFLE)
         self.cards: List[Card] = []
         
         # Initialize 3 card deck
         for rank in ('QKA'):
-            self.cards.append(Card.new(rank + 'h'))
\ No newline at end of file
+            self.cards.append(Card.new(rank + 'h'))
+        self._all_cards = tuple(self.cards)
+
+
+class DealBuffer:
+    """
+    Prefetches deals in batches for consecutive iterations (or hands).
+
+    The deal for iteration i comes from the DEALS stream batch keyed by (seed, i // batch_size), so it is the
+    same whichever process asks for it and in whatever order.
+
+    `next` hands out deals in order from `start`, for callers such as simulations that just
+    need fresh deals. MCCFR training deals from DealBuffer(seed=model.seed), so simulations
+    should use a different seed to avoid replaying the training deals.
+    """
+    def __init__(self, deck: Deck, cards_per_deal: int, seed: int = 0, batch_size: int = 4096, start: int = 0):
+        self.deck = deck
+        self.cards_per_deal = cards_per_deal
+        self.seed = seed
+        self.batch_size = batch_size
+        self.position = start
+        self._batch_index = None
+        self._batch = None
+
+    def get(self, i: int) -> List[int]:
+        batch_index, row = divmod(i, self.batch_size)
+        if batch_index != self._batch_index:
+            stream = RandomStream(self.seed, batch_index, domain=DEALS)
+            self._batch = self.deck.deal_batch(self.batch_size, self.cards_per_deal, stream).tolist()
+            self._batch_index = batch_index
+        return self._batch[row]
+
+    def next(self) -> Tuple[int, List[int]]:
+        """
+        The next unused deal and its index.
+        """
+        i = self.position
+        self.position += 1
+        return i, self.get(i)
@@ -0,0 +1,284 @@
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from .mccfr import MCCFR
+from .rng import RESERVOIR, RandomStream
+
+
+def encode_infoset_key(key: str, dim: int) -> np.ndarray:
+    """
+    Hashed bag-of-tokens features for an infoset key. Every '|'-separated field contributes
+    its individual cards/actions tagged with their field and position, plus the whole field,
+    so keys from any game in this repo can be encoded without game-specific code.
+    """
+    x = np.zeros(dim, dtype=np.float32)
+    x[0] = 1.0  # bias
+    for field, part in enumerate(key.split('|')):
+        tokens = part.split(',') if ',' in part else list(part)
+        for position, token in enumerate(tokens):
+            x[1 + zlib.crc32(f"{field}:{position}:{token}".encode()) % (dim - 1)] = 1.0
+            x[1 + zlib.crc32(f"{field}:{token}".encode()) % (dim - 1)] = 1.0
+        x[1 + zlib.crc32(f"{field}={part}".encode()) % (dim - 1)] = 1.0
+    return x
+
+
+class ReservoirBuffer:
+    """
+    Fixed-capacity uniform sample of everything ever added (reservoir sampling).
+    """
+    def __init__(self, capacity: int, dim: int, num_actions: int, seed: int = 0):
+        self.capacity = capacity
+        self.features = np.zeros((capacity, dim), dtype=np.float32)
+        self.masks = np.zeros((capacity, num_actions), dtype=np.float32)
+        self.targets = np.zeros((capacity, num_actions), dtype=np.float32)
+        self.weights = np.zeros(capacity, dtype=np.float32)
+        self.seen = 0
+        self.rng = RandomStream(seed, domain=RESERVOIR)
+
+    def __len__(self):
+        return min(self.seen, self.capacity)
+
+    def add(self, features, mask, target, weight):
+        if self.seen < self.capacity:
+            slot = self.seen
+        else:
+            slot = self.rng.randrange(self.seen + 1)
+        self.seen += 1
+        if slot < self.capacity:
+            self.features[slot] = features
+            self.masks[slot] = mask
+            self.targets[slot] = target
+            self.weights[slot] = weight
+
+    def __getstate__(self):
+        # Only the filled rows; the rest is preallocated zeros
+        state = self.__dict__.copy()
+        n = len(self)
+        for name in ('features', 'masks', 'targets', 'weights'):
+            state[name] = state[name][:n].copy()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for name in ('features', 'masks', 'targets', 'weights'):
+            filled = getattr(self, name)
+            array = np.zeros((self.capacity,) + filled.shape[1:], dtype=filled.dtype)
+            array[:len(filled)] = filled
+            setattr(self, name, array)
+
+
+class MLP:
+    """
+    One-hidden-layer ReLU network trained with Adam on a masked, weighted squared error.
+    """
+    def __init__(self, dim: int, hidden: int, num_actions: int, seed: int = 0):
+        generator = np.random.default_rng(seed)
+        self.params = [
+            generator.normal(0, np.sqrt(2 / dim), (dim, hidden)).astype(np.float32),
+            np.zeros(hidden, dtype=np.float32),
+            generator.normal(0, np.sqrt(1 / hidden), (hidden, num_actions)).astype(np.float32),
+            np.zeros(num_actions, dtype=np.float32),
+        ]
+        self._m = [np.zeros_like(p) for p in self.params]
+        self._v = [np.zeros_like(p) for p in self.params]
+        self._step = 0
+        self.generator = generator
+
+    def predict(self, x):
+        w1, b1, w2, b2 = self.params
+        return np.maximum(x @ w1 + b1, 0) @ w2 + b2
+
+    def fit(self, buffer: ReservoirBuffer, steps: int, batch_size: int = 256, lr: float = 1e-3):
+        n = len(buffer)
+        if n == 0:
+            return 0.0
+
+        w1, b1, w2, b2 = self.params
+        loss = 0.0
+        for _ in range(steps):
+            idx = self.generator.integers(0, n, min(batch_size, n))
+            x = buffer.features[idx]
+            mask = buffer.masks[idx]
+            weight = buffer.weights[idx][:, None] / max(buffer.weights[idx].mean(), 1e-12)
+
+            h = np.maximum(x @ w1 + b1, 0)
+            error = (h @ w2 + b2 - buffer.targets[idx]) * mask * weight
+            loss = float((error ** 2).sum() / len(idx))
+
+            d_out = 2 * error / len(idx)
+            d_h = (d_out @ w2.T) * (h > 0)
+            grads = [x.T @ d_h, d_h.sum(axis=0), h.T @ d_out, d_out.sum(axis=0)]
+            self._adam(grads, lr)
+        return loss
+
+    def _adam(self, grads, lr, beta1=0.9, beta2=0.999, eps=1e-8):
+        self._step += 1
+        for p, g, m, v in zip(self.params, grads, self._m, self._v):
+            m *= beta1
+            m += (1 - beta1) * g
+            v *= beta2
+            v += (1 - beta2) * g * g
+            m_hat = m / (1 - beta1 ** self._step)
+            v_hat = v / (1 - beta2 ** self._step)
+            p -= lr * m_hat / (np.sqrt(v_hat) + eps)
+
+
+class ApproxInfoset:
+    """
+    Stands in for Infoset during a traversal. The strategy comes from the advantage network;
+    the regret and strategy sums only collect this iteration's updates, which DeepMCCFR moves
+    into its reservoir buffers at the end of the iteration.
+    """
+    def __init__(self, features, valid_action_indices, strategy, num_actions):
+        self.features = features
+        self.valid_action_indices = valid_action_indices
+        self.num_valid_actions = len(valid_action_indices)
+        self.strategy = strategy
+        self.regret_sum = np.zeros(num_actions)
+        self.strategy_sum = np.zeros(num_actions)
+        self.visited_count = 0
+
+    def get_strategy(self):
+        return self.strategy
+
+    def increment_visited_count(self):
+        self.visited_count += 1
+
+
+class DeepMCCFR(MCCFR):
+    """
+    Deep CFR style MCCFR: instead of one Infoset per infoset key, regrets and the average
+    strategy are represented by small networks over hashed infoset-key features.
+
+    Sampled regrets (advantages) and strategies are kept in fixed-size reservoir buffers,
+    weighted by iteration as in linear CFR. The advantage network is refit every `train_every`
+    iterations and the average-strategy network when it is next needed. Memory is bounded by
+    the buffer and network sizes, not by the number of infosets.
+
+    Pickles keep only the filled part of the buffers, so training can resume from them. Call
+    `drop_buffers` before pickling a model that will only be served.
+    """
+    def __init__(
+        self,
+        game_class,
+        num_actions: int,
+        feature_dim: int = 128,
+        hidden: int = 64,
+        buffer_size: int = 100000,
+        train_every: int = 100,
+        train_steps: int = 200,
+        batch_size: int = 256,
+        learning_rate: float = 1e-3,
+        cache_size: int = 100000,
+        seed: int = 0,
+        worker: int = 0,
+    ):
+        super().__init__(game_class, num_actions, seed=seed, worker=worker)
+        self.feature_dim = feature_dim
+        self.train_every = train_every
+        self.train_steps = train_steps
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.cache_size = cache_size
+
+        self.advantage_net = MLP(feature_dim, hidden, num_actions, seed=seed)
+        self.strategy_net = MLP(feature_dim, hidden, num_actions, seed=seed + 1)
+        self.advantage_memory = ReservoirBuffer(buffer_size, feature_dim, num_actions, seed=seed)
+        self.strategy_memory = ReservoirBuffer(buffer_size, feature_dim, num_actions, seed=seed + 1)
+        self.strategy_net_stale = False
+
+        self._features = OrderedDict()
+        self._strategies = {}
+        self._pending = []
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['_features'] = OrderedDict()
+        state['_strategies'] = {}
+        state['_pending'] = []
+        return state
+
+    def drop_buffers(self):
+        """
+        Fits the average-strategy network if needed and frees the reservoir buffers, leaving
+        only what serving needs. The model can no longer be trained afterwards.
+        """
+        if self.strategy_net_stale:
+            self.fit_average_strategy()
+        self.advantage_memory = None
+        self.strategy_memory = None
+
+    def features(self, infoset_key):
+        x = self._features.get(infoset_key)
+        if x is None:
+            x = encode_infoset_key(infoset_key, self.feature_dim)
+            self._features[infoset_key] = x
+            if len(self._features) > self.cache_size:
+                self._features.popitem(last=False)
+        return x
+
+    def _mask(self, valid_action_indices):
+        mask = np.zeros(self.num_actions, dtype=np.float32)
+        mask[valid_action_indices] = 1.0
+        return mask
+
+    def get_infoset(self, infoset_key, valid_action_indices) -> ApproxInfoset:
+        x = self.features(infoset_key)
+
+        strategy = self._strategies.get(infoset_key)
+        if strategy is None:
+            # Regret matching on the predicted advantages
+            advantages = self.advantage_net.predict(x)
+            strategy = np.zeros(self.num_actions)
+            positive = np.maximum(advantages[valid_action_indices], 0)
+            total = positive.sum()
+            if total > 0:
+                strategy[valid_action_indices] = positive / total
+            else:
+                strategy[valid_action_indices[int(advantages[valid_action_indices].argmax())]] = 1.0
+            if len(self._strategies) < self.cache_size:
+                self._strategies[infoset_key] = strategy
+
+        infoset = ApproxInfoset(x, valid_action_indices, strategy, self.num_actions)
+        self._pending.append(infoset)
+        return infoset
+
+    def end_iteration(self, iteration):
+        if self.advantage_memory is None:
+            raise RuntimeError("This model's buffers were dropped for serving; it can't be trained further.")
+        for infoset in self._pending:
+            mask = self._mask(infoset.valid_action_indices)
+            if infoset.regret_sum.any():
+                self.advantage_memory.add(infoset.features, mask, infoset.regret_sum / infoset.visited_count, iteration)
+            self.strategy_memory.add(infoset.features, mask, infoset.strategy_sum / infoset.visited_count, iteration)
+        self._pending = []
+        self.strategy_net_stale = True
+
+        if iteration % self.train_every == 0:
+            self.advantage_net.fit(self.advantage_memory, self.train_steps, self.batch_size, self.learning_rate)
+            self._strategies = {}
+
+    def fit_average_strategy(self, steps: int = None):
+        self.strategy_net.fit(self.strategy_memory, steps or 5 * self.train_steps, self.batch_size, self.learning_rate)
+        self.strategy_net_stale = False
+
+    def average_strategy(self, infoset_key, valid_action_indices=None):
+        if self.strategy_net_stale:
+            self.fit_average_strategy()
+
+        if valid_action_indices is None:
+            # Without an infoset table the network can't tell which actions are legal here
+            raise ValueError("DeepMCCFR needs the valid action indices of the infoset.")
+        valid_action_indices = list(valid_action_indices)
+        predicted = self.strategy_net.predict(self.features(infoset_key))
+
+        strategy = np.zeros(self.num_actions)
+        probs = np.maximum(predicted[valid_action_indices], 0)
+        total = probs.sum()
+        if total > 0:
+            strategy[valid_action_indices] = probs / total
+        else:
+            strategy[valid_action_indices] = 1.0 / len(valid_action_indices)
+        return strategy
@@ -0,0 +1,107 @@
+import numpy as np
+
+MAX_EXACT_DEALS = 10000
+
+
+def deals_for(game, max_exact_deals: int = MAX_EXACT_DEALS, num_deals: int = 2000, seed: int = 0):
+    """
+    Every distinct deal of the game when there are at most `max_exact_deals` of them,
+    otherwise `num_deals` deals sampled uniformly with equal weights. Samples come from the
+    EVALUATION stream, so they are not the deals the model was trained on.
+    """
+    try:
+        return game.deck.enumerate_deals(game.deal_groups, max_deals=max_exact_deals)
+    except ValueError:
+        from .rng import EVALUATION, RandomStream
+        deals = game.deck.deal_batch(num_deals, sum(game.deal_groups), RandomStream(seed, domain=EVALUATION))
+        return deals, np.full(num_deals, 1.0 / num_deals)
+
+
+def exploitability(model, deals=None, weights=None, max_exact_deals: int = MAX_EXACT_DEALS, num_deals: int = 2000, seed: int = 0):
+    """
+    Exploitability of the model's average strategy: the mean of what a best response gains
+    against each seat. Exact when every deal is enumerated, an estimate over sampled deals otherwise.
+
+    The sampled estimate is biased upward: the best response picks its action at each infoset
+    from the same deals it is scored on, so it fits the sample. The fewer deals share an
+    infoset, the closer it gets to a best response that sees the opponent's cards (on
+    HoldemGame nearly every sampled deal has its own infoset). On a 20k-iteration PocketPoker
+    model, 2000 sampled deals gave 0.04-0.05 where the exact value was 0.019. Use sampled
+    estimates to compare models on the same deals, not as an absolute stopping criterion.
+
+    Assumes the betting tree (valid actions and terminal histories) does not depend on the cards,
+    which holds for every game in this repo.
+    """
+    game = model.game_class()
+    if deals is None:
+        deals, weights = deals_for(game, max_exact_deals, num_deals, seed)
+    deals = [list(row) for row in np.asarray(deals).tolist()]
+    weights = np.asarray(weights, dtype=float)
+
+    strategies = {}
+    values = [
+        best_response(model, game, deals, [], br_player, weights.copy(), strategies).sum()
+        for br_player in range(2)
+    ]
+    return (values[0] + values[1]) / 2
+
+
+def average_strategy(model, key, valid_action_indices, strategies):
+    strategy = strategies.get(key)
+    if strategy is None:
+        try:
+            strategy = model.average_strategy(key, valid_action_indices)
+        except KeyError:
+            strategy = np.zeros(model.num_actions)
+            strategy[valid_action_indices] = 1.0 / len(valid_action_indices)
+        strategies[key] = strategy
+    return strategy
+
+
+def best_response(model, game, deals, history, br_player, reach, strategies):
+    """
+    Per-deal values for `br_player` playing a best response below `history`, weighted by
+    chance and the opponent's probability of reaching it.
+    """
+    game.deal(deals[0])
+    if game.is_terminal(history):
+        values = np.empty(len(deals))
+        for d, cards in enumerate(deals):
+            game.deal(cards)
+            values[d] = game.get_terminal_utility(history, br_player)
+        return values * reach
+
+    acting_player = game.current_player(history)
+    valid_action_indices = [action.value for action in game.valid_actions(history)]
+
+    keys = []
+    for cards in deals:
+        game.deal(cards)
+        keys.append(game.get_infoset_key(acting_player, history))
+
+    if acting_player != br_player:
+        probs = np.array([average_strategy(model, key, valid_action_indices, strategies) for key in keys])
+        values = np.zeros(len(deals))
+        for a in valid_action_indices:
+            history.append(a)
+            values += best_response(model, game, deals, history, br_player, reach * probs[:, a], strategies)
+            history.pop()
+        return values
+
+    action_values = []
+    for a in valid_action_indices:
+        history.append(a)
+        action_values.append(best_response(model, game, deals, history, br_player, reach, strategies))
+        history.pop()
+    action_values = np.array(action_values)
+
+    # The best responder can't see the opponent's cards, so it picks one action per infoset
+    groups = {}
+    for d, key in enumerate(keys):
+        groups.setdefault(key, []).append(d)
+
+    values = np.empty(len(deals))
+    for members in groups.values():
+        best = action_values[:, members].sum(axis=1).argmax()
+        values[members] = action_values[best, members]
+    return values
@@ -0,0 +1,182 @@
+"""
+Quantized strategy export for serving.
+
+Serving only needs the average strategy, so the export keeps just the probabilities of each
+infoset's valid actions, quantized to 8 or 16 bits, under a sorted key index:
+    keys            sorted infoset keys (bytes), looked up by binary search
+    action_masks    bit a is set when action a is valid at that infoset (uint8 up to 8 actions,
+                    wider types for more)
+    probs           quantized probabilities of the valid actions, infoset after infoset
+
+Quantization uses largest remainders so each infoset's levels sum to exactly 2**bits - 1;
+dequantized strategies sum to 1 and every probability is off by less than 1 / (2**bits - 1).
+
+Usage:
+    python -m src.export mccfr_model mccfr_strategy.npz --bits 8
+    python -m src.export deep_model deep_strategy.npz --infosets infosets.json
+
+Models without an infoset table (DeepMCCFR) need `--infosets`: a JSON object mapping each
+infoset key to export to its valid action indices.
+"""
+import argparse
+import json
+import os
+import pickle
+
+import numpy as np
+
+from .rng import default_stream
+
+DTYPES = {8: np.uint8, 16: np.uint16}
+MASK_DTYPES = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+def quantize(probs: np.ndarray, bits: int) -> np.ndarray:
+    levels = (1 << bits) - 1
+    scaled = probs / probs.sum() * levels
+    q = np.floor(scaled).astype(np.int64)
+    short = levels - q.sum()
+    if short > 0:
+        q[np.argsort(q - scaled)[:short]] += 1
+    return q
+
+
+def mask_dtype(num_actions: int):
+    """
+    Smallest unsigned integer type with a bit for every action.
+    """
+    for dtype in MASK_DTYPES:
+        if num_actions <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"Action masks support at most 64 actions, got num_actions={num_actions}.")
+
+
+def export_strategy(model, path, bits: int = 8, infosets=None):
+    """
+    Writes the model's average strategy as a quantized artifact and returns a report of its
+    size and the largest probability error.
+
+    Exports every infoset in `model.nodes`, or the (infoset_key, valid_action_indices) pairs in
+    `infosets` for models without a node table (e.g. DeepMCCFR).
+    """
+    if bits not in DTYPES:
+        raise ValueError(f"bits must be one of {sorted(DTYPES)}.")
+
+    if infosets is None:
+        infosets = ((key, model.nodes[key].valid_action_indices) for key in model.nodes)
+    infosets = dict(infosets)
+    if not infosets:
+        raise ValueError("No infosets to export. Pass `infosets` for models without a node table (e.g. DeepMCCFR).")
+
+    levels = (1 << bits) - 1
+    keys = sorted(infosets)
+    masks = np.zeros(len(keys), dtype=mask_dtype(model.num_actions))
+    probs = []
+    max_error = 0.0
+
+    for i, key in enumerate(keys):
+        valid_action_indices = sorted(infosets[key])
+        strategy = model.average_strategy(key, valid_action_indices)[valid_action_indices]
+        q = quantize(strategy, bits)
+        max_error = max(max_error, float(np.abs(q / levels - strategy).max()))
+        masks[i] = sum(1 << a for a in valid_action_indices)
+        probs.extend(q.tolist())
+
+    np.savez_compressed(
+        path,
+        keys=np.array([key.encode() for key in keys], dtype=bytes),
+        action_masks=masks,
+        probs=np.array(probs, dtype=DTYPES[bits]),
+        num_actions=np.array(model.num_actions),
+        bits=np.array(bits),
+    )
+
+    if not path.endswith('.npz'):
+        path += '.npz'
+    return {
+        'path': path,
+        'infosets': len(keys),
+        'bits': bits,
+        'artifact_bytes': os.path.getsize(path),
+        'max_error': max_error,
+    }
+
+
+class QuantizedStrategy:
+    """
+    Serves moves straight from an exported artifact, with the same average_strategy /
+    choose_move interface as MCCFR.
+    """
+    def __init__(self, keys, action_masks, probs, num_actions, bits):
+        self.keys = keys
+        self.action_masks = action_masks
+        self.probs = probs
+        self.num_actions = num_actions
+        self.levels = (1 << bits) - 1
+        counts = np.bitwise_count(action_masks).astype(np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.rng = default_stream()
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data['keys'], data['action_masks'], data['probs'],
+                int(data['num_actions']), int(data['bits']),
+            )
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _index(self, infoset_key):
+        encoded = infoset_key.encode()
+        i = int(np.searchsorted(self.keys, encoded))
+        if i == len(self.keys) or self.keys[i] != encoded:
+            raise KeyError(infoset_key)
+        return i
+
+    def average_strategy(self, infoset_key, valid_action_indices=None):
+        i = self._index(infoset_key)
+        mask = int(self.action_masks[i])
+        levels = self.probs[self.offsets[i]:self.offsets[i + 1]]
+
+        strategy = np.zeros(self.num_actions)
+        strategy[[a for a in range(self.num_actions) if mask >> a & 1]] = levels / self.levels
+        return strategy
+
+    def choose_move(self, infoset_key, valid_action_indices=None):
+        return self.rng.sample(self.average_strategy(infoset_key, valid_action_indices))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a trained model's average strategy for serving")
+    parser.add_argument('model', help="Pickled MCCFR model")
+    parser.add_argument('out', help="Artifact path (.npz)")
+    parser.add_argument('--bits', type=int, choices=sorted(DTYPES), default=8)
+    parser.add_argument('--infosets', help="JSON object mapping infoset keys to their valid action indices")
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)
+
+    infosets = None
+    if args.infosets:
+        with open(args.infosets) as f:
+            infosets = json.load(f)
+
+    report = export_strategy(model, args.out, args.bits, infosets)
+
+    # What serving the model would load: its pickle plus any node store file it points to
+    model_bytes = os.path.getsize(args.model)
+    file_size = getattr(getattr(model, 'nodes', None), 'file_size', None)
+    if file_size is not None:
+        model_bytes += file_size()
+
+    artifact_bytes = report['artifact_bytes']
+    print(f"Exported {report['infosets']} infosets to {report['path']} at {report['bits']} bits")
+    print(f"Size: {model_bytes:,} -> {artifact_bytes:,} bytes ({model_bytes / artifact_bytes:.1f}x smaller)")
+    print(f"Max probability error: {report['max_error']:.6f}")
+
+
+if __name__ == '__main__':
+    main()
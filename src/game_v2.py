@@ -1,4 +1,5 @@
-from .deck import Deck, PocketPokerDeck, KuhnPokerDeck
+from .deck import Deck, PocketPokerDeck, KuhnPokerDeck, DealBuffer
+from .hand_history import HandHistoryWriter
 from .player import Player, PlayerAction
 from treys import Card, Evaluator
 
@@ -6,6 +7,9 @@ class SimpleGame:
     """
     An even-more-simplifed poker game for use with MCCFR
     """
+    # Sizes of the card groups in one deal, in the order they are drawn
+    deal_groups = (1, 1, 1, 4)
+
     def __init__(self, player1_cards = [], player2_cards = [], community_cards = [], final_cards = [], seed: int = None):
         self.deck = Deck(seed=seed)
         self.player1_cards = player1_cards
@@ -26,9 +30,15 @@ class SimpleGame:
         folded = PlayerAction.FOLD.value in history
         return both_checked or raised_and_called or folded
 
+    def current_player(self, history):
+        """
+        Players strictly alternate in this game
+        """
+        return len(history) % 2
+
     def get_terminal_utility(self, history, acting_player):
         """
-        Assumes that player1 is the "hero" and returns a utility value based on player1's terminal performance
+        Returns the utility of the terminal state for acting_player (zero-sum)
         """
         if not self.is_terminal(history):
             raise RuntimeError("Current game is not at a terminal state!")
@@ -55,10 +65,16 @@ class SimpleGame:
     def setup(self):
         self.deck.reset()
         self.deck.shuffle()
-        self.player1_cards = self.deck.draw(1)
-        self.player2_cards = self.deck.draw(1)
-        self.community_cards = self.deck.draw(1)
-        self.final_cards = self.deck.draw(4)
+        self.deal(self.deck.draw(sum(self.deal_groups)))
+
+    def deal(self, cards):
+        """
+        Sets the cards from one deal: player1 | player2 | community | final (see deal_groups)
+        """
+        self.player1_cards = cards[0:1]
+        self.player2_cards = cards[1:2]
+        self.community_cards = cards[2:3]
+        self.final_cards = cards[3:7]
 
     def valid_actions(self, history):
         actions = []
@@ -75,37 +91,37 @@ class SimpleGame:
     def evaluate(self, hand, board):
         return self.evaluator.evaluate(hand, board)
     
-    def showdown(self):
+    def showdown(self, acting_player):
         """
-        1 if player1 wins
+        1 if acting_player wins
         0 if tie
-        -1 if player2 wins
+        -1 if acting_player loses
         """
         total_board = self.community_cards + self.final_cards
         p1_score = self.evaluate(self.player1_cards, total_board)
         p2_score = self.evaluate(self.player2_cards, total_board)
 
         if p1_score < p2_score:
-            return 1
+            return 1 if acting_player == 0 else -1
         elif p1_score > p2_score:
-            return -1
+            return -1 if acting_player == 0 else 1
         else:
             return 0
 
 
 class PocketPoker(SimpleGame):
+    deal_groups = (2, 2, 1)
+
     def __init__(self, player1_cards=[], player2_cards=[], community_cards=[], seed = None):
         self.deck = PocketPokerDeck(seed=seed)
         self.player1_cards = player1_cards
         self.player2_cards = player2_cards
         self.community_cards = community_cards
 
-    def setup(self):
-        self.deck.reset()
-        self.deck.shuffle()
-        self.player1_cards = self.deck.draw(2)
-        self.player2_cards = self.deck.draw(2)
-        self.community_cards = self.deck.draw(1)
+    def deal(self, cards):
+        self.player1_cards = cards[0:2]
+        self.player2_cards = cards[2:4]
+        self.community_cards = cards[4:5]
 
     def _sorted_cards(self, cards):
         return "".join([Card.int_to_str(c)[:1] for c in list(sorted(cards))])
@@ -165,7 +181,10 @@ class PocketPoker(SimpleGame):
             if verbose:
                 print(f"{player.name} raises by $1.")
     
-    def betting_round(self, player1: Player, player2: Player, verbose=True):
+    def betting_round(self, player1: Player, player2: Player, verbose=True, infoset_keys=None):
+        """
+        Returns the action history; if given, `infoset_keys` collects the acting player's key for each action
+        """
         history = []
         current_player = player1
         current_player_id = 0
@@ -179,6 +198,8 @@ class PocketPoker(SimpleGame):
             action = current_player.best_move(infoset, valid_actions, hand_strength)
             self.handle_action(current_player, action, verbose)
             history.append(action)
+            if infoset_keys is not None:
+                infoset_keys.append(infoset)
             
             if player1.folded or player2.folded:
                 break
@@ -193,13 +214,16 @@ class PocketPoker(SimpleGame):
         
         return history
         
-    def play_round(self, player1: Player, player2: Player, round: int, verbose=True):
+    def play_round(self, player1: Player, player2: Player, round: int, verbose=True, cards=None, recorder: HandHistoryWriter = None, seed=None, deal=None):
         if verbose:
             print("\n" + "=" * 50)
             print(f"Round {round} starting. {player1.name}: ${player1.chips} | {player2.name}: ${player2.chips}")
             print("=" * 50)
 
-        self.setup()
+        if cards is None:
+            self.setup()
+        else:
+            self.deal(cards)
         player1.new_round()
         player2.new_round()
         player1.set_hand = self.player1_cards
@@ -209,7 +233,8 @@ class PocketPoker(SimpleGame):
             print(f"Community Cards: {Card.ints_to_pretty_str(self.community_cards)}")
             print(f"{player1.name} Cards: {Card.ints_to_pretty_str(self.player1_cards)}")
 
-        history = self.betting_round(player1, player2, verbose)
+        infoset_keys = [] if recorder is not None else None
+        history = self.betting_round(player1, player2, verbose, infoset_keys)
 
         if verbose:
             print(f"{player2.name} Cards: {Card.ints_to_pretty_str(self.player2_cards)}")
@@ -227,8 +252,20 @@ class PocketPoker(SimpleGame):
         player1.edit_chips(final_score)
         player2.edit_chips(-final_score)
 
+        if recorder is not None:
+            recorder.record(
+                self.deck.seed if seed is None else seed, deal, round, player1.name, player2.name,
+                self.player1_cards, self.player2_cards, self.community_cards,
+                history, infoset_keys, final_score,
+            )
+
         
-    def play_game(self, player1: Player, player2: Player, rounds: int = 10, verbose=True):
+    def play_game(self, player1: Player, player2: Player, rounds: int = 10, verbose=True, deals: DealBuffer = None, recorder: HandHistoryWriter = None):
+        """
+        Pass a DealBuffer to take each round's cards from prefetched deals instead of shuffling
+        (rounds take the buffer's next deals, so repeated games get new ones; use a seed other
+        than the training model's), and a HandHistoryWriter to record every hand
+        """
         player1.reset_player()
         player2.reset_player()
         p1 = player1
@@ -237,7 +274,11 @@ class PocketPoker(SimpleGame):
             if p1.chips <= 0 or p2.chips <= 0:
                 break
 
-            self.play_round(p1, p2, i+1, verbose)
+            deal, cards, seed = None, None, None
+            if deals is not None:
+                deal, cards = deals.next()
+                seed = deals.seed
+            self.play_round(p1, p2, i+1, verbose, cards, recorder, seed, deal)
             p1, p2 = p2, p1 # switch turns
 
         if verbose:
@@ -246,16 +287,16 @@ class PocketPoker(SimpleGame):
         return player1.chips, player2.chips
 
 class KuhnPoker(SimpleGame):
+    deal_groups = (1, 1)
+
     def __init__(self, player1_cards=[], player2_cards=[], seed = None):
         self.deck = KuhnPokerDeck(seed=seed)
         self.player1_cards = player1_cards
         self.player2_cards = player2_cards
 
-    def setup(self):
-        self.deck.reset()
-        self.deck.shuffle()
-        self.player1_cards = self.deck.draw(1)
-        self.player2_cards = self.deck.draw(1)
+    def deal(self, cards):
+        self.player1_cards = cards[0:1]
+        self.player2_cards = cards[1:2]
 
     def _sorted_cards(self, cards):
         return "".join([Card.int_to_str(c)[:1] for c in list(sorted(cards))])
@@ -0,0 +1,146 @@
+"""
+Columnar hand histories for simulations.
+
+Hands are buffered column by column and written in blocks. Each block is a row count followed
+by one .npy array per column, so a reader can stream the file block by block without loading
+it whole, and writing costs a few array dumps per block instead of formatting every hand.
+
+Columns (one entry per hand unless noted):
+    seed, deal              how to reproduce the cards: row `deal` of DealBuffer(deck, ..., seed=seed),
+                            or a Deck(seed=seed) shuffle when deal is -1 (seed is -1 if unseeded)
+    hand                    hand number
+    player1, player2        player names (UTF-8)
+    player1_cards, player2_cards, community_cards   card ints, one row per hand
+    action_offsets          hand i's actions are actions[action_offsets[i]:action_offsets[i + 1]]
+    actions, infoset_keys   one entry per action: the action and the acting player's infoset key,
+                            dictionary-encoded as indices into key_table (unique UTF-8 keys in the block)
+    payoff                  chips won by player1
+"""
+import numpy as np
+
+MAGIC = b'CFRHH2\n'
+
+COLUMNS = (
+    'seed', 'deal', 'hand', 'player1', 'player2', 'player1_cards', 'player2_cards', 'community_cards',
+    'action_offsets', 'actions', 'key_table', 'infoset_keys', 'payoff',
+)
+
+
+def encode(strings):
+    # dtype=bytes alone only accepts ASCII
+    return np.array([s.encode('utf-8') for s in strings], dtype=bytes)
+
+
+class HandHistoryWriter:
+    def __init__(self, path, batch_size: int = 10000):
+        self.path = path
+        self.batch_size = batch_size
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+        self.hands_written = 0
+        self._reset_batch()
+
+    def _reset_batch(self):
+        self._rows = {name: [] for name in COLUMNS if name != 'key_table'}
+        self._rows['action_offsets'].append(0)
+
+    def record(self, seed, deal, hand, player1, player2, player1_cards, player2_cards, community_cards, actions, infoset_keys, payoff):
+        rows = self._rows
+        rows['seed'].append(-1 if seed is None else seed)
+        rows['deal'].append(-1 if deal is None else deal)
+        rows['hand'].append(hand)
+        rows['player1'].append(player1)
+        rows['player2'].append(player2)
+        rows['player1_cards'].append(player1_cards)
+        rows['player2_cards'].append(player2_cards)
+        rows['community_cards'].append(community_cards)
+        rows['actions'].extend(actions)
+        rows['infoset_keys'].extend(infoset_keys)
+        rows['action_offsets'].append(len(rows['actions']))
+        rows['payoff'].append(payoff)
+
+        if len(rows['hand']) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        rows = self._rows
+        n = len(rows['hand'])
+        if n == 0:
+            return
+
+        key_table, key_codes = np.unique(encode(rows['infoset_keys']), return_inverse=True)
+        arrays = {
+            'seed': np.array(rows['seed'], dtype=np.int64),
+            'deal': np.array(rows['deal'], dtype=np.int64),
+            'hand': np.array(rows['hand'], dtype=np.int64),
+            'player1': encode(rows['player1']),
+            'player2': encode(rows['player2']),
+            'player1_cards': np.array(rows['player1_cards'], dtype=np.int32).reshape(n, -1),
+            'player2_cards': np.array(rows['player2_cards'], dtype=np.int32).reshape(n, -1),
+            'community_cards': np.array(rows['community_cards'], dtype=np.int32).reshape(n, -1),
+            'action_offsets': np.array(rows['action_offsets'], dtype=np.int64),
+            'actions': np.array(rows['actions'], dtype=np.int8),
+            'key_table': key_table,
+            'infoset_keys': key_codes.astype(np.int32),
+            'payoff': np.array(rows['payoff'], dtype=np.float64),
+        }
+
+        np.save(self._file, np.array([n], dtype=np.int64))
+        for name in COLUMNS:
+            np.save(self._file, arrays[name], allow_pickle=False)
+
+        self.hands_written += n
+        self._reset_batch()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_blocks(path):
+    """
+    Yields the file one block at a time as a dict of column arrays.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a hand history file.")
+        while True:
+            try:
+                n = int(np.load(f)[0])
+            except EOFError:
+                return
+            block = {name: np.load(f, allow_pickle=False) for name in COLUMNS}
+            block['rows'] = n
+            yield block
+
+
+def iter_hands(path):
+    """
+    Yields one dict per hand. Prefer read_blocks for bulk analysis.
+    """
+    for block in read_blocks(path):
+        offsets = block['action_offsets']
+        key_table = [key.decode('utf-8') for key in block['key_table'].tolist()]
+        for i in range(block['rows']):
+            start, end = offsets[i], offsets[i + 1]
+            yield {
+                'seed': int(block['seed'][i]),
+                'deal': int(block['deal'][i]),
+                'hand': int(block['hand'][i]),
+                'player1': block['player1'][i].decode('utf-8'),
+                'player2': block['player2'][i].decode('utf-8'),
+                'player1_cards': block['player1_cards'][i].tolist(),
+                'player2_cards': block['player2_cards'][i].tolist(),
+                'community_cards': block['community_cards'][i].tolist(),
+                'actions': block['actions'][start:end].tolist(),
+                'infoset_keys': [key_table[code] for code in block['infoset_keys'][start:end].tolist()],
+                'payoff': float(block['payoff'][i]),
+            }
@@ -0,0 +1,240 @@
+from .deck import Deck
+from .player import PlayerAction
+from treys import Card, Evaluator
+
+FOLD = PlayerAction.FOLD.value
+CHECK = PlayerAction.CHECK.value
+CALL = PlayerAction.CALL.value
+RAISE = PlayerAction.RAISE.value
+
+# Shared, never mutated by the engine. Callers must not mutate them either.
+FACING_BET = [PlayerAction.FOLD, PlayerAction.CALL, PlayerAction.RAISE]
+FACING_BET_CAPPED = [PlayerAction.FOLD, PlayerAction.CALL]
+NOT_FACING_BET = [PlayerAction.CHECK, PlayerAction.RAISE]
+NOT_FACING_BET_CAPPED = [PlayerAction.CHECK]
+NO_ACTIONS = []
+
+ACTION_CHARS = 'fkcr'
+BOARD_SIZES = (0, 3, 4, 5, 5)
+SHOWDOWN = 4
+
+# Building the treys lookup tables is far more expensive than a whole traversal, so share one
+_evaluator = None
+
+
+def get_evaluator() -> Evaluator:
+    global _evaluator
+    if _evaluator is None:
+        _evaluator = Evaluator()
+    return _evaluator
+
+
+class HoldemGame:
+    """
+    Silent heads-up fixed-limit hold'em state machine for tree search (e.g. MCCFR).
+
+    Player 0 is the small blind: first to act preflop, last to act after. Bets are one big
+    blind preflop and on the flop and two on the turn and river, with at most `max_raises`
+    raises per street. Short stacks go all-in and the board is run out.
+
+    The engine keeps the current state and an undo stack, so `apply` and `undo` are O(1).
+    The MCCFR interface (`is_terminal`, `valid_actions`, `current_player`, `get_infoset_key`,
+    `get_terminal_utility`) takes the action history and syncs to it by undoing and applying
+    the difference. This is cheap when the history grows and shrinks depth-first, as it does
+    during a traversal; histories are assumed to extend or truncate the previous one.
+    """
+    deal_groups = (2, 2, 5)
+
+    def __init__(
+        self,
+        player1_cards=None,
+        player2_cards=None,
+        board=None,
+        stack: int = 20,
+        small_blind: int = 1,
+        big_blind: int = 2,
+        max_raises: int = 3,
+        seed: int = None
+    ):
+        if stack <= big_blind:
+            raise ValueError("Stacks must be larger than the big blind.")
+
+        self.deck = Deck(seed=seed)
+        self.evaluator = get_evaluator()
+        self.stack = stack
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.max_raises = max_raises
+        self.bet_sizes = (big_blind, big_blind, 2 * big_blind, 2 * big_blind)
+
+        self.deal(list(player1_cards or []) + list(player2_cards or []) + list(board or []))
+
+    def setup(self):
+        self.deck.reset()
+        self.deck.shuffle()
+        self.deal(self.deck.draw(sum(self.deal_groups)))
+
+    def deal(self, cards):
+        """
+        Sets the cards from one deal (player1 | player2 | board) and resets the betting
+        to the start of the hand.
+        """
+        self.hands = (cards[0:2], cards[2:4])
+        self.board = cards[4:9]
+        self._ranks = None
+        self._hand_strs = tuple(''.join(Card.int_to_str(c) for c in sorted(hand)) for hand in self.hands)
+        # The flop's order carries no information, so sort it; the turn and river keep their place
+        board = sorted(self.board[:3]) + list(self.board[3:])
+        self._board_strs = tuple(
+            ''.join(Card.int_to_str(c) for c in board[:n]) for n in BOARD_SIZES
+        )
+        self.reset()
+
+    def reset(self):
+        self.stacks = [self.stack - self.small_blind, self.stack - self.big_blind]
+        self.bets = [self.small_blind, self.big_blind]
+        self.contributed = [self.small_blind, self.big_blind]
+        self.pot = self.small_blind + self.big_blind
+        self.street = 0
+        self.to_act = 0
+        self.raises = 0
+        self.street_actions = 0
+        self.folded = -1
+        self.terminal = False
+        self.action_str = ''
+        self.actions = []
+        self._undo = []
+
+    def apply(self, action: int):
+        stacks = self.stacks
+        bets = self.bets
+        self._undo.append((
+            stacks[0], stacks[1], bets[0], bets[1], self.contributed[0], self.contributed[1],
+            self.pot, self.street, self.to_act, self.raises, self.street_actions,
+            self.folded, self.terminal, self.action_str,
+        ))
+        self.actions.append(action)
+        self.action_str += ACTION_CHARS[action]
+
+        p = self.to_act
+        o = 1 - p
+
+        if action == FOLD:
+            self.folded = p
+            self.terminal = True
+            return
+
+        if action == RAISE:
+            amount = min(bets[o] - bets[p] + self.bet_sizes[self.street], stacks[p])
+            self._put_in(p, amount)
+            self.raises += 1
+            self.street_actions += 1
+            self.to_act = o
+            return
+
+        if action == CALL:
+            self._put_in(p, min(bets[o] - bets[p], stacks[p]))
+            if stacks[0] == 0 or stacks[1] == 0:
+                # All-in and called: run the board out
+                self.street = SHOWDOWN
+                self.terminal = True
+                return
+
+        self.street_actions += 1
+        if self.street_actions >= 2 and bets[0] == bets[1]:
+            self._next_street()
+        else:
+            self.to_act = o
+
+    def undo(self):
+        (
+            self.stacks[0], self.stacks[1], self.bets[0], self.bets[1],
+            self.contributed[0], self.contributed[1], self.pot, self.street, self.to_act,
+            self.raises, self.street_actions, self.folded, self.terminal, self.action_str,
+        ) = self._undo.pop()
+        return self.actions.pop()
+
+    def _put_in(self, player, amount):
+        self.stacks[player] -= amount
+        self.bets[player] += amount
+        self.contributed[player] += amount
+        self.pot += amount
+
+    def _next_street(self):
+        self.street += 1
+        self.action_str += '/'
+        if self.street == SHOWDOWN:
+            self.terminal = True
+            return
+        self.bets[0] = self.bets[1] = 0
+        self.raises = 0
+        self.street_actions = 0
+        self.to_act = 1
+
+    def _sync(self, history):
+        actions = self.actions
+        while len(actions) > len(history):
+            self.undo()
+        while actions and actions[-1] != history[len(actions) - 1]:
+            self.undo()
+        for action in history[len(actions):]:
+            self.apply(action)
+
+    def _showdown_ranks(self):
+        if self._ranks is None:
+            self._ranks = (
+                self.evaluator.evaluate(self.hands[0], self.board),
+                self.evaluator.evaluate(self.hands[1], self.board),
+            )
+        return self._ranks
+
+    def is_terminal(self, history):
+        self._sync(history)
+        return self.terminal
+
+    def current_player(self, history):
+        self._sync(history)
+        return self.to_act
+
+    def valid_actions(self, history):
+        self._sync(history)
+        if self.terminal:
+            return NO_ACTIONS
+
+        p = self.to_act
+        o = 1 - p
+        to_call = self.bets[o] - self.bets[p]
+        can_raise = self.raises < self.max_raises and self.stacks[p] > to_call and self.stacks[o] > 0
+
+        if to_call > 0:
+            return FACING_BET if can_raise else FACING_BET_CAPPED
+        return NOT_FACING_BET if can_raise else NOT_FACING_BET_CAPPED
+
+    def get_infoset_key(self, acting_player, history):
+        """
+        hole cards | visible board | actions, with '/' closing each street
+        (f = fold, k = check, c = call, r = raise), e.g. "AhKs|2c7d9h|cr/k"
+        """
+        self._sync(history)
+        return f"{self._hand_strs[acting_player]}|{self._board_strs[self.street]}|{self.action_str}"
+
+    def get_terminal_utility(self, history, player):
+        """
+        Chips won (or lost) by `player` in the hand.
+        """
+        self._sync(history)
+        if not self.terminal:
+            raise RuntimeError("Current game is not at a terminal state!")
+
+        if self.folded >= 0:
+            amount = self.contributed[self.folded]
+            return -amount if player == self.folded else amount
+
+        # Only the matched part of the pot is contested; any uncalled excess goes back
+        amount = min(self.contributed)
+        p1_score, p2_score = self._showdown_ranks()
+        if p1_score == p2_score:
+            return 0
+
+        p1_wins = p1_score < p2_score
+        return amount if p1_wins == (player == 0) else -amount
@@ -1,5 +1,10 @@
 import numpy as np
-import random
+import signal
+import threading
+import time
+from .rng import ACTIONS, RandomStream, default_stream
+from .deck import DealBuffer
+from .exploitability import MAX_EXACT_DEALS, exploitability
 
 class Infoset:
     """
@@ -54,43 +59,237 @@ class MCCFR:
     """
     Handles the Monte Carlo Counterfactual Regret Minimization (MCCFR) algorithm logic
     """
-    def __init__(self, game_class, num_actions: int):
+    def __init__(self, game_class, num_actions: int, nodes=None, seed: int = 0, worker: int = 0):
+        """
+        `nodes` can be any mapping from infoset key to Infoset (e.g. a TieredNodeStore
+        for tables larger than memory); defaults to a plain dict.
+
+        Sampling during iteration i uses the random stream keyed by (seed, i, worker), so runs
+        are reproducible however the iterations are split between processes.
+        """
         self.game_class = game_class
         self.num_actions = num_actions
-        self.nodes = {}
+        self.nodes = {} if nodes is None else nodes
+        self.seed = seed
+        self.worker = worker
+        self.rng = default_stream()
+        self.warm_start_from = None
+
+    def __setstate__(self, state):
+        # Models pickled before seeded streams existed
+        state.setdefault('seed', 0)
+        state.setdefault('worker', 0)
+        state.setdefault('rng', default_stream())
+        state.setdefault('warm_start_from', None)
+        self.__dict__.update(state)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['rng']
+        # The coarse model and key mapping are only needed while new infosets are still being seeded
+        state['warm_start_from'] = None
+        return state
 
     def get_infoset(self, infoset_key, valid_action_indices) -> Infoset:
-        if infoset_key not in self.nodes:
-            self.nodes[infoset_key] = Infoset(self.num_actions, valid_action_indices)
-        return self.nodes[infoset_key]
+        infoset = self.nodes.get(infoset_key)
+        if infoset is None:
+            infoset = Infoset(self.num_actions, valid_action_indices)
+            if self.warm_start_from is not None:
+                self._seed_infoset(infoset_key, infoset)
+            self.nodes[infoset_key] = infoset
+        return infoset
+
+    def warm_start(self, coarse_model, key_map, weight: float = 10.0):
+        """
+        Initializes this model's infosets from a model trained on a coarser abstraction.
+        `key_map(key)` maps an infoset key of this game to the coarse game's key (or None).
+
+        Infosets are seeded as they are first created. Each gets the coarse infoset's regrets
+        and average strategy as if they had been accumulated over `weight` visits, so every
+        fine infoset mapped to the same coarse one starts out equally confident, however many
+        times the coarse infoset was visited.
+        """
+        self.warm_start_from = (coarse_model, key_map, weight)
+
+    def _seed_infoset(self, infoset_key, infoset):
+        coarse_model, key_map, weight = self.warm_start_from
+        coarse_key = key_map(infoset_key)
+        if coarse_key is None or coarse_key not in coarse_model.nodes:
+            return
+
+        coarse = coarse_model.nodes[coarse_key]
+        visits = max(coarse.visited_count, 1)
+        average = coarse.get_average_strategy()
+        for a in infoset.valid_action_indices:
+            if a in coarse.valid_action_indices:
+                infoset.regret_sum[a] = coarse.regret_sum[a] / visits * weight
+                infoset.strategy_sum[a] = average[a] * weight
+
+    def end_iteration(self, iteration):
+        """
+        Called after both traversals of an iteration, when no infoset is held by the recursion.
+        """
+        trim = getattr(self.nodes, 'trim', None)
+        if trim is not None:
+            trim()
     
-    def train(self, iterations=1000):
+    def train(self, iterations=1000, start_iteration=1):
+        """
+        Runs `iterations` iterations, dealing iteration i's cards from a DealBuffer keyed by the
+        model's seed. Passing a different `start_iteration` lets several machines train on
+        disjoint iteration ranges (see sharding.py). Returns the final snapshot (see train_iter).
+        """
         print(f"Starting External Sampling MCCFR training for {iterations} iterations...")
-        util = np.zeros(2)
-        
-        for i in range(1, iterations + 1):
-            if i % (iterations // 10) == 0:
-                print(f"Iteration {i}/{iterations}")
-            
-            for traversing_player in range(2):
-                game = self.game_class(seed=i)
-                game.setup()
-                util[traversing_player] += self.external_cfr(game, [], traversing_player)
+
+        report_every = max(iterations // 10, 1)
+        snapshot = None
+        for snapshot in self.train_iter(iterations, start_iteration, snapshot_every=report_every):
+            if snapshot['iterations_done'] and snapshot['iterations_done'] % report_every == 0:
+                print(f"Iteration {snapshot['iterations_done']}/{iterations}")
         
         print("Training complete!")
-        print(f"Average game value: {util[0]/iterations}")
-        for i in sorted(self.nodes):
-            print(i, self.nodes[i].get_average_strategy(), self.nodes[i].visited_count)
+        print(f"Average game value: {snapshot['game_value']}")
+        if isinstance(self.nodes, dict):
+            for i in sorted(self.nodes):
+                print(i, self.nodes[i].get_average_strategy(), self.nodes[i].visited_count)
+        else:
+            # Listing a store that spills to disk would read back every cold entry
+            print(f"Infosets: {len(self.nodes)}")
+
+        stats = getattr(self.nodes, 'stats', None)
+        if stats is not None:
+            print(f"Node store: {stats()}")
+
+        return snapshot
+
+    def train_iter(
+        self,
+        iterations=None,
+        start_iteration=1,
+        time_budget=None,
+        snapshot_every=None,
+        snapshot_interval=None,
+        target_exploitability=None,
+        exploitability_deals=None,
+        stop_condition=None,
+        stop_event=None,
+        handle_interrupt=True,
+    ):
+        """
+        Streaming training: a generator that yields progress snapshots and stops on whichever
+        comes first of
+            iterations              number of iterations to run
+            time_budget             wall-clock seconds
+            target_exploitability   checked at every snapshot (see exploitability.py), over
+                                    `exploitability_deals` (deals, weights) or else every deal;
+                                    raises ValueError if the game has too many deals to enumerate,
+                                    since sampled estimates are biased upward
+            stop_condition          callable(snapshot) -> bool, checked at every snapshot
+            stop_event              a threading.Event set by another thread
+        or when the caller stops iterating. Snapshots are taken every `snapshot_every` iterations
+        and/or every `snapshot_interval` seconds, and once more when training stops.
+
+        Snapshots are dicts with iteration, iterations_done, elapsed, nodes, game_value,
+        exploitability (None unless a target is set) and stopped (the stop reason, or None).
+
+        The model is only ever paused between iterations, so it is consistent whenever a snapshot
+        is yielded. With `handle_interrupt`, Ctrl-C in the main thread finishes the current
+        iteration and stops with reason 'interrupted' instead of raising mid-traversal.
+        """
+        util = np.zeros(2)
+        game = self.game_class()
+        deals = DealBuffer(game.deck, sum(game.deal_groups), seed=self.seed)
+
+        if target_exploitability is not None and exploitability_deals is None:
+            try:
+                exploitability_deals = game.deck.enumerate_deals(game.deal_groups, max_deals=MAX_EXACT_DEALS)
+            except ValueError as e:
+                raise ValueError(
+                    "target_exploitability needs exploitability_deals for games with too many deals "
+                    "to enumerate: estimates over sampled deals are biased upward (see exploitability.py)."
+                ) from e
+
+        start = time.perf_counter()
+        last_snapshot = start
+        interrupted = False
+
+        def on_interrupt(signum, frame):
+            nonlocal interrupted
+            interrupted = True
+
+        def snapshot(i, stopped):
+            done = i - start_iteration + 1
+            return {
+                'iteration': i,
+                'iterations_done': done,
+                'elapsed': time.perf_counter() - start,
+                'nodes': len(self.nodes),
+                'game_value': float(util[0] / done) if done else 0.0,
+                'exploitability': None,
+                'stopped': stopped,
+            }
+
+        i = start_iteration - 1
+        stopped = None
+        if iterations is not None and iterations <= 0:
+            yield snapshot(i, 'iterations')
+            return
+
+        while stopped is None:
+            previous_handler = None
+            if handle_interrupt and threading.current_thread() is threading.main_thread():
+                previous_handler = signal.signal(signal.SIGINT, on_interrupt)
+
+            try:
+                while True:
+                    i += 1
+                    self.rng = RandomStream(self.seed, i, self.worker, domain=ACTIONS)
+                    game.deal(deals.get(i))
+                    for traversing_player in range(2):
+                        util[traversing_player] += self.external_cfr(game, [], traversing_player)
+                    self.end_iteration(i)
+
+                    done = i - start_iteration + 1
+                    now = time.perf_counter()
+                    if interrupted:
+                        stopped = 'interrupted'
+                    elif stop_event is not None and stop_event.is_set():
+                        stopped = 'cancelled'
+                    elif iterations is not None and done >= iterations:
+                        stopped = 'iterations'
+                    elif time_budget is not None and now - start >= time_budget:
+                        stopped = 'time_budget'
+
+                    if (
+                        stopped is not None
+                        or (snapshot_every and done % snapshot_every == 0)
+                        or (snapshot_interval and now - last_snapshot >= snapshot_interval)
+                    ):
+                        break
+            finally:
+                if previous_handler is not None:
+                    signal.signal(signal.SIGINT, previous_handler)
+
+            last_snapshot = time.perf_counter()
+            current = snapshot(i, stopped)
+            if target_exploitability is not None:
+                current['exploitability'] = float(exploitability(self, *exploitability_deals))
+                if stopped is None and current['exploitability'] <= target_exploitability:
+                    stopped = current['stopped'] = 'target'
+            if stopped is None and stop_condition is not None and stop_condition(current):
+                stopped = current['stopped'] = 'condition'
+            yield current
     
     def external_cfr(self, game, history, traversing_player):
-        plays = len(history)
-        acting_player = plays % 2
-
+        """
+        `history` is extended and truncated in place, so games can follow the traversal
+        incrementally (see HoldemGame).
+        """
         # Terminal node check
         if game.is_terminal(history):
-            mult = 1 if acting_player == traversing_player else -1
-            return game.get_terminal_utility(history, acting_player) * mult
+            return game.get_terminal_utility(history, traversing_player)
         
+        acting_player = game.current_player(history)
         valid_actions = game.valid_actions(history)
         valid_action_indices = [action.value for action in valid_actions]
 
@@ -109,8 +308,9 @@ class MCCFR:
             
             # Try each action and compute utility
             for a in valid_action_indices:
-                next_history = history + [a]
-                action_utils[a] = self.external_cfr(game, next_history, traversing_player)
+                history.append(a)
+                action_utils[a] = self.external_cfr(game, history, traversing_player)
+                history.pop()
                 infoset_util += strategy[a] * action_utils[a]
             
             for a in valid_action_indices:
@@ -120,16 +320,21 @@ class MCCFR:
             return infoset_util
         else: #acting_player != traversing_player
             action_idx = self.sample_action(strategy)
-            next_history = history + [action_idx]
-            
-            util = self.external_cfr(game, next_history, traversing_player)
+            history.append(action_idx)
+            util = self.external_cfr(game, history, traversing_player)
+            history.pop()
             
             return util
     
     def sample_action(self, strategy):
-        return random.choices([i for i in range(self.num_actions)], weights = strategy, k = 1)[0]
+        return self.rng.sample(strategy)
     
-    def choose_move(self, infoset_key):
-        infoset = self.nodes[infoset_key]
-        strategy = infoset.get_average_strategy()
+    def average_strategy(self, infoset_key, valid_action_indices=None):
+        """
+        Average strategy at an infoset; raises KeyError for infosets the model has never seen.
+        """
+        return self.nodes[infoset_key].get_average_strategy()
+
+    def choose_move(self, infoset_key, valid_action_indices=None):
+        strategy = self.average_strategy(infoset_key, valid_action_indices)
         return self.sample_action(strategy)
\ No newline at end of file
@@ -0,0 +1,182 @@
+import heapq
+import os
+import pickle
+import sqlite3
+from collections.abc import MutableMapping
+
+
+class TieredNodeStore(MutableMapping):
+    """
+    Infoset store for MCCFR whose regret tables can grow beyond RAM.
+
+    Frequently visited infosets live in an in-memory hot tier; when the hot tier grows
+    past `capacity`, the least visited entries are pickled out to a SQLite table
+    (key -> blob) and faulted back in the next time training asks for them.
+
+    Evictions upsert the row, so a faulted-in entry keeps its (stale) row on disk and the
+    hot copy takes precedence until it is evicted again. Rows are only ever overwritten,
+    and SQLite reuses the pages of overwritten rows, so the file stays proportional to the
+    number of distinct infosets. Only the hot keys are kept in memory.
+
+    `get` is the training path and promotes cold entries into the hot tier. Plain
+    indexing and iteration read cold entries without promoting them, so changes made
+    to an object read that way are not written back.
+    """
+    def __init__(self, path, capacity: int = 100000, evict_fraction: float = 0.1):
+        self.path = path
+        self.capacity = capacity
+        self.evict_fraction = evict_fraction
+        self.hot = {}
+        # Hot keys that also have a row on disk, so len() needs no scan of the table
+        self._on_disk = set()
+        # The file is a spill area, not a durable database: skip fsyncs, flush() commits
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.execute('CREATE TABLE IF NOT EXISTS nodes (key TEXT PRIMARY KEY, data BLOB NOT NULL)')
+        self._db.commit()
+        self._rows = self._db.execute('SELECT COUNT(*) FROM nodes').fetchone()[0]
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.faults = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def _read(self, key):
+        row = self._db.execute('SELECT data FROM nodes WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self.bytes_read += len(row[0])
+        return pickle.loads(row[0])
+
+    def _has_row(self, key):
+        return self._db.execute('SELECT 1 FROM nodes WHERE key = ?', (key,)).fetchone() is not None
+
+    def _write(self, items):
+        """
+        Upserts (key, infoset) pairs in one transaction and returns how many new rows were added.
+        """
+        rows = []
+        added = 0
+        for key, infoset in items:
+            data = pickle.dumps(infoset, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, data))
+            self.bytes_written += len(data)
+            if key not in self._on_disk:
+                added += 1
+        with self._db:
+            self._db.executemany('INSERT OR REPLACE INTO nodes (key, data) VALUES (?, ?)', rows)
+        self._rows += added
+        return added
+
+    def get(self, key, default=None):
+        infoset = self.hot.get(key)
+        if infoset is not None:
+            self.hits += 1
+            return infoset
+
+        infoset = self._read(key)
+        if infoset is None:
+            self.misses += 1
+            return default
+
+        self.faults += 1
+        self.hot[key] = infoset
+        self._on_disk.add(key)
+        return infoset
+
+    def __getitem__(self, key):
+        infoset = self.hot.get(key)
+        if infoset is None:
+            infoset = self._read(key)
+            if infoset is None:
+                raise KeyError(key)
+        return infoset
+
+    def __setitem__(self, key, infoset):
+        if key not in self.hot and self._has_row(key):
+            self._on_disk.add(key)
+        self.hot[key] = infoset
+
+    def __delitem__(self, key):
+        in_hot = self.hot.pop(key, None) is not None
+        with self._db:
+            deleted = self._db.execute('DELETE FROM nodes WHERE key = ?', (key,)).rowcount
+        self._rows -= deleted
+        self._on_disk.discard(key)
+        if not in_hot and not deleted:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.hot or self._has_row(key)
+
+    def __iter__(self):
+        hot = list(self.hot)
+        yield from hot
+        hot = set(hot)
+        for (key,) in self._db.execute('SELECT key FROM nodes'):
+            if key not in hot:
+                yield key
+
+    def __len__(self):
+        return self._rows + len(self.hot) - len(self._on_disk)
+
+    def trim(self):
+        """
+        Evicts the least visited hot entries once the hot tier is over capacity.
+        Must only be called when no infoset is held by a traversal (between iterations).
+        """
+        if len(self.hot) <= self.capacity:
+            return 0
+
+        target = int(self.capacity * (1 - self.evict_fraction))
+        n = len(self.hot) - target
+        coldest = heapq.nsmallest(n, self.hot.items(), key=lambda item: item[1].visited_count)
+        self._write(coldest)
+        for key, _ in coldest:
+            del self.hot[key]
+            self._on_disk.discard(key)
+
+        self.evictions += n
+        return n
+
+    def flush(self):
+        """
+        Spills every hot entry to disk, leaving the hot tier empty.
+        """
+        self._write(self.hot.items())
+        self.hot.clear()
+        self._on_disk.clear()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def file_size(self):
+        return os.path.getsize(self.path)
+
+    def stats(self):
+        lookups = self.hits + self.faults + self.misses
+        return {
+            'hot': len(self.hot),
+            'cold': self._rows,
+            'hits': self.hits,
+            'faults': self.faults,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'file_bytes': self.file_size(),
+        }
+
+    def __getstate__(self):
+        # Entries are persisted in the SQLite file, so a pickle only needs to record where it is
+        self.flush()
+        return {'path': self.path, 'capacity': self.capacity, 'evict_fraction': self.evict_fraction}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['capacity'], state['evict_fraction'])
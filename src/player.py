@@ -1,7 +1,7 @@
 from enum import Enum
 from abc import ABC, abstractmethod
 from .mccfr import MCCFR
-import random
+from .rng import default_stream
 
 class PlayerAction(Enum):
     FOLD = 0
@@ -65,7 +65,7 @@ class Player(ABC):
 
 class RandomPlayer(Player):
     def best_move(self, infoset_key, valid_actions, hand_strength):
-        return random.choice(valid_actions).value
+        return valid_actions[default_stream().randrange(len(valid_actions))].value
     
 
 class AggressivePlayer(Player):
@@ -130,7 +130,7 @@ class MCCFRPlayer(Player):
         self.__init__(self.name, self.model, self.initial_chips)
     
     def best_move(self, infoset_key, valid_actions, hand_strength):
-        return self.model.choose_move(infoset_key)
+        return self.model.choose_move(infoset_key, [a.value for a in valid_actions])
     
 
 class EpsilonPlayer(MCCFRPlayer):
@@ -148,7 +148,7 @@ class EpsilonPlayer(MCCFRPlayer):
         valid_action_indices = [a.value for a in valid_actions]
         best_move = self.model.choose_move(infoset_key, valid_action_indices)
 
-        if random.random() < self.epsilon:
+        if default_stream().random() < self.epsilon:
             return valid_actions[(best_move + 1) % len(valid_action_indices)].value
         else:
             return best_move
@@ -0,0 +1,111 @@
+import numpy as np
+
+MASK_64 = (1 << 64) - 1
+
+# Stream domains, so streams drawn for different purposes from the same (seed, iteration, worker)
+# never overlap
+ACTIONS = 0     # MCCFR action sampling
+DEALS = 1       # DealBuffer batches
+EVALUATION = 2  # deals sampled to evaluate a model (kept apart from the training deals)
+RESERVOIR = 3   # Deep CFR reservoir sampling
+SHUFFLE = 4     # seeded Deck shuffles
+SIMULATION = 5  # players sampling moves outside of training
+
+
+class RandomStream:
+    """
+    Deterministic random stream keyed by (seed, domain, iteration, worker).
+
+    Uses the counter-based Philox generator: (seed, domain) is the Philox key, so each purpose
+    (see the domains above) gets an independent generator, and (iteration, worker) select a
+    disjoint block of its counter space, so any process can reproduce the stream of
+    any iteration without replaying the ones before it. Uniforms are generated in NumPy
+    batches and handed out one at a time.
+    """
+    def __init__(self, seed: int = None, iteration: int = 0, worker: int = 0, domain: int = ACTIONS, buffer_size: int = 256):
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1, np.uint64)[0])
+
+        self.seed = seed
+        self.iteration = iteration
+        self.worker = worker
+        self.domain = domain
+        self.buffer_size = buffer_size
+        bit_generator = np.random.Philox(
+            key=[seed & MASK_64, domain],
+            counter=[0, 0, iteration & MASK_64, worker & MASK_64],
+        )
+        self.generator = np.random.Generator(bit_generator)
+        self._initial_state = bit_generator.state
+        self._buffer = []
+        self._pos = 0
+        self._refills = 0
+
+    def _refill(self):
+        self._buffer = self.generator.random(self.buffer_size).tolist()
+        self._pos = 0
+        self._refills += 1
+
+    def rewind(self) -> None:
+        """
+        Restarts the stream from its first value, e.g. to replay a seeded deck's shuffles.
+        """
+        if self._refills == 1:
+            # The first batch is still buffered
+            self._pos = 0
+            return
+        self.generator.bit_generator.state = self._initial_state
+        self._buffer = []
+        self._pos = 0
+        self._refills = 0
+
+    def random(self) -> float:
+        if self._pos == len(self._buffer):
+            self._refill()
+        u = self._buffer[self._pos]
+        self._pos += 1
+        return u
+
+    def randrange(self, n: int) -> int:
+        return int(self.random() * n)
+
+    def sample(self, weights) -> int:
+        """
+        Index drawn with probability proportional to `weights` (e.g. a strategy).
+        """
+        total = sum(weights)
+        if not total > 0:
+            raise ValueError("Cannot sample from weights that do not sum to a positive number.")
+        u = self.random() * total
+        last = 0
+        for i, w in enumerate(weights):
+            if w > 0:
+                u -= w
+                if u < 0:
+                    return i
+                last = i
+        return last
+
+    def shuffle(self, items) -> None:
+        for i in range(len(items) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            items[i], items[j] = items[j], items[i]
+
+
+_default_stream = None
+
+
+def default_stream() -> RandomStream:
+    """
+    Process-wide stream for sampling outside of training (e.g. players in simulations).
+    """
+    global _default_stream
+    if _default_stream is None:
+        _default_stream = RandomStream(domain=SIMULATION)
+    return _default_stream
+
+
+def seed_default_stream(seed: int, worker: int = 0) -> RandomStream:
+    global _default_stream
+    _default_stream = RandomStream(seed, worker=worker, domain=SIMULATION)
+    return _default_stream
@@ -0,0 +1,63 @@
+import pytest
+
+from src.deck import DealBuffer, Deck, PocketPokerDeck
+from src.game_v2 import PocketPoker
+from src.player import RandomPlayer
+from src.rng import RandomStream
+
+
+def test_seeded_reset_shuffles_like_a_new_deck():
+    deck = PocketPokerDeck(seed=3)
+    for _ in range(3):
+        deck.reset()
+        deck.shuffle()
+        hand = deck.draw(5)
+
+        fresh = PocketPokerDeck(seed=3)
+        fresh.shuffle()
+        assert hand == fresh.draw(5)
+        assert len(deck.cards) == 15
+
+
+def test_unseeded_reset_restores_the_cards():
+    deck = Deck()
+    deck.shuffle()
+    deck.draw(10)
+    deck.reset()
+    assert sorted(deck.cards) == sorted(Deck().cards)
+
+
+def test_rewind_replays_the_stream():
+    stream = RandomStream(7, buffer_size=4)
+    first = [stream.random() for _ in range(10)]
+    stream.rewind()
+    assert [stream.random() for _ in range(10)] == first
+
+    stream = RandomStream(7, buffer_size=4)
+    stream.random()
+    stream.rewind()
+    assert [stream.random() for _ in range(10)] == first
+
+
+def test_sample_rejects_weights_without_mass():
+    stream = RandomStream(0)
+    assert stream.sample([0, 0, 1, 0]) == 2
+    with pytest.raises(ValueError):
+        stream.sample([0.0, 0.0, 0.0])
+
+
+def test_deal_buffer_hands_out_fresh_deals():
+    deck = PocketPokerDeck()
+    deals = DealBuffer(deck, 5, seed=1, batch_size=8, start=3)
+    indices = [deals.next()[0] for _ in range(10)]
+    assert indices == list(range(3, 13))
+    assert deals.next()[1] == DealBuffer(deck, 5, seed=1, batch_size=8).get(13)
+
+
+def test_repeated_games_do_not_replay_deals():
+    game = PocketPoker()
+    deals = DealBuffer(game.deck, sum(game.deal_groups), seed=1)
+    player1, player2 = RandomPlayer('a', chips=1000), RandomPlayer('b', chips=1000)
+    game.play_game(player1, player2, rounds=5, verbose=False, deals=deals)
+    game.play_game(player1, player2, rounds=5, verbose=False, deals=deals)
+    assert deals.position == 10
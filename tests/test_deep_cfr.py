@@ -0,0 +1,42 @@
+import pickle
+
+import pytest
+
+from src.deep_cfr import DeepMCCFR
+from src.game_v2 import KuhnPoker
+from src.mccfr import MCCFR
+
+
+def kuhn_infosets():
+    table = MCCFR(KuhnPoker, 4)
+    for _ in table.train_iter(200):
+        pass
+    return {key: infoset.valid_action_indices for key, infoset in table.nodes.items()}
+
+
+def test_only_valid_actions_are_chosen():
+    model = DeepMCCFR(KuhnPoker, 4, buffer_size=5000, train_every=50, train_steps=50)
+    for _ in model.train_iter(300):
+        pass
+
+    for key, valid_action_indices in kuhn_infosets().items():
+        strategy = model.average_strategy(key, valid_action_indices)
+        assert strategy.sum() == pytest.approx(1.0)
+        assert all(strategy[a] == 0 for a in range(4) if a not in valid_action_indices)
+        for _ in range(50):
+            assert model.choose_move(key, valid_action_indices) in valid_action_indices
+
+    with pytest.raises(ValueError):
+        model.choose_move('K|')
+
+
+def test_serving_pickle_drops_buffers():
+    model = DeepMCCFR(KuhnPoker, 4, buffer_size=5000, train_every=50, train_steps=50)
+    for _ in model.train_iter(100):
+        pass
+    expected = model.average_strategy('K|', [1, 3])
+
+    model.drop_buffers()
+    restored = pickle.loads(pickle.dumps(model))
+    assert restored.advantage_memory is None
+    assert restored.average_strategy('K|', [1, 3]) == pytest.approx(expected)
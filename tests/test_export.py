@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.export import QuantizedStrategy, export_strategy
+from src.game_v2 import KuhnPoker
+from src.mccfr import Infoset, MCCFR
+
+
+def round_trip(model, path, bits):
+    report = export_strategy(model, str(path), bits)
+    strategy = QuantizedStrategy.load(report['path'])
+    assert len(strategy) == len(model.nodes)
+
+    levels = (1 << bits) - 1
+    for key, infoset in model.nodes.items():
+        expected = model.average_strategy(key)
+        served = strategy.average_strategy(key)
+        assert np.abs(served - expected).max() <= 1 / levels
+        assert served.sum() == pytest.approx(1.0)
+        assert strategy.choose_move(key) in infoset.valid_action_indices
+    return strategy
+
+
+@pytest.mark.parametrize('bits', [8, 16])
+def test_round_trip(tmp_path, bits):
+    model = MCCFR(KuhnPoker, 4)
+    for _ in model.train_iter(500):
+        pass
+    round_trip(model, tmp_path / 'kuhn.npz', bits)
+
+
+@pytest.mark.parametrize('num_actions', [9, 20, 40, 64])
+def test_round_trip_wide_action_masks(tmp_path, num_actions):
+    model = MCCFR(KuhnPoker, num_actions)
+    generator = np.random.default_rng(0)
+    for i in range(20):
+        valid_action_indices = sorted(generator.choice(num_actions, 3, replace=False).tolist() + [num_actions - 1])
+        valid_action_indices = sorted(set(valid_action_indices))
+        infoset = Infoset(num_actions, valid_action_indices)
+        infoset.strategy_sum[valid_action_indices] = generator.random(len(valid_action_indices))
+        model.nodes[f"key{i}"] = infoset
+    round_trip(model, tmp_path / 'wide.npz', 8)
+
+
+def test_empty_export_raises(tmp_path):
+    with pytest.raises(ValueError):
+        export_strategy(MCCFR(KuhnPoker, 4), str(tmp_path / 'empty.npz'))
+
+
+def test_export_leaves_node_store_alone(tmp_path):
+    from src.node_store import TieredNodeStore
+
+    store = TieredNodeStore(str(tmp_path / 'nodes.sqlite'), capacity=8)
+    model = MCCFR(KuhnPoker, 4, nodes=store)
+    for _ in model.train_iter(200):
+        pass
+    hot = len(store.hot)
+
+    round_trip(model, tmp_path / 'tiered.npz', 8)
+    assert len(store.hot) == hot
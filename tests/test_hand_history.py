@@ -0,0 +1,66 @@
+from src.deck import DealBuffer
+from src.game_v2 import PocketPoker
+from src.hand_history import HandHistoryWriter, iter_hands, read_blocks
+from src.player import RandomPlayer
+
+
+def record_hands(path, batch_size, rounds, deals=None, seed=None):
+    game = PocketPoker(seed=seed)
+    if deals is not None:
+        deals = DealBuffer(game.deck, sum(game.deal_groups), seed=deals)
+    with HandHistoryWriter(path, batch_size=batch_size) as writer:
+        game.play_game(RandomPlayer('Zoë', chips=1000), RandomPlayer('Bob', chips=1000), rounds, verbose=False, deals=deals, recorder=writer)
+    return writer
+
+
+def test_round_trip_across_blocks(tmp_path):
+    path = str(tmp_path / 'hands.bin')
+    writer = record_hands(path, batch_size=4, rounds=10, deals=7)
+    assert writer.hands_written == 10
+
+    blocks = list(read_blocks(path))
+    assert [block['rows'] for block in blocks] == [4, 4, 2]
+    for block in blocks:
+        offsets = block['action_offsets']
+        assert offsets[0] == 0 and offsets[-1] == len(block['actions']) == len(block['infoset_keys'])
+        assert block['infoset_keys'].max() < len(block['key_table'])
+
+    hands = list(iter_hands(path))
+    assert [hand['hand'] for hand in hands] == list(range(1, 11))
+    # Players switch seats every round
+    assert {hand['player1'] for hand in hands} == {'Zoë', 'Bob'}
+    for hand in hands:
+        assert len(hand['actions']) == len(hand['infoset_keys']) > 0
+        assert len(hand['player1_cards']) == 2 and len(hand['community_cards']) == 1
+
+
+def test_deal_buffer_hands_can_be_reproduced(tmp_path):
+    path = str(tmp_path / 'hands.bin')
+    record_hands(path, batch_size=3, rounds=6, deals=7)
+
+    deck = PocketPoker().deck
+    for hand in iter_hands(path):
+        assert hand['seed'] == 7
+        cards = DealBuffer(deck, 5, seed=hand['seed']).get(hand['deal'])
+        assert sorted(cards[0:2]) == sorted(hand['player1_cards'])
+        assert sorted(cards[2:4]) == sorted(hand['player2_cards'])
+        assert cards[4:] == hand['community_cards']
+    assert [hand['deal'] for hand in iter_hands(path)] == list(range(6))
+
+
+def test_shuffled_hands_record_the_deck_seed(tmp_path):
+    path = str(tmp_path / 'hands.bin')
+    record_hands(path, batch_size=100, rounds=3, seed=5)
+    hands = list(iter_hands(path))
+    assert len(hands) == 3
+    assert all(hand['seed'] == 5 and hand['deal'] == -1 for hand in hands)
+
+    record_hands(path, batch_size=100, rounds=3)
+    assert all(hand['seed'] == -1 for hand in iter_hands(path))
+
+
+def test_empty_file(tmp_path):
+    path = str(tmp_path / 'hands.bin')
+    HandHistoryWriter(path).close()
+    assert list(read_blocks(path)) == []
+    assert list(iter_hands(path)) == []
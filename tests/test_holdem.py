@@ -0,0 +1,134 @@
+from treys import Card
+
+from src.holdem import CALL, CHECK, FOLD, RAISE, SHOWDOWN, HoldemGame
+from src.player import PlayerAction
+
+
+def cards(*names):
+    return [Card.new(name) for name in names]
+
+
+def make_game(stack=20, board=('2c', '7d', '9h', 'Js', '3s')):
+    # Player 0 (small blind) holds aces, player 1 kings
+    return HoldemGame(cards('Ah', 'Ad'), cards('Kh', 'Kd'), cards(*board), stack=stack)
+
+
+def test_blinds_posted():
+    game = make_game()
+    assert game.stacks == [19, 18]
+    assert game.bets == [1, 2]
+    assert game.pot == 3
+    assert game.current_player([]) == 0
+    assert game.valid_actions([]) == [PlayerAction.FOLD, PlayerAction.CALL, PlayerAction.RAISE]
+    assert game.get_infoset_key(0, []) == 'AhAd||'
+
+
+def test_small_blind_fold():
+    game = make_game()
+    assert game.is_terminal([FOLD])
+    assert game.get_terminal_utility([FOLD], 0) == -1
+    assert game.get_terminal_utility([FOLD], 1) == 1
+
+
+def test_street_transitions():
+    game = make_game()
+    preflop = [CALL, CHECK]
+    assert not game.is_terminal(preflop)
+    assert game.street == 1
+    assert game.bets == [0, 0]
+    assert game.current_player(preflop) == 1
+    assert game.valid_actions(preflop) == [PlayerAction.CHECK, PlayerAction.RAISE]
+    assert game.get_infoset_key(1, preflop) == 'KhKd|2c7d9h|ck/'
+
+    turn = preflop + [RAISE, CALL]
+    assert game.get_infoset_key(0, turn) == 'AhAd|2c7d9hJs|ck/rc/'
+    assert game.current_player(turn) == 1
+    assert game.pot == 8
+
+    river = turn + [CHECK, CHECK]
+    assert game.get_infoset_key(0, river) == 'AhAd|2c7d9hJs3s|ck/rc/kk/'
+
+    end = river + [RAISE, CALL]
+    assert game.is_terminal(end)
+    assert game.street == SHOWDOWN
+    assert game.contributed == [8, 8]
+    assert game.get_terminal_utility(end, 0) == 8
+    assert game.get_terminal_utility(end, 1) == -8
+
+
+def test_raise_cap():
+    game = make_game()
+    history = [RAISE, RAISE, RAISE]
+    assert not game.is_terminal(history)
+    assert game.contributed == [8, 6]
+    assert game.current_player(history) == 1
+    assert game.valid_actions(history) == [PlayerAction.FOLD, PlayerAction.CALL]
+
+    # The cap is per street
+    flop = history + [CALL]
+    assert game.current_player(flop) == 1
+    assert game.valid_actions(flop) == [PlayerAction.CHECK, PlayerAction.RAISE]
+
+
+def test_all_in_runs_out_the_board():
+    game = make_game(stack=5)
+    history = [RAISE, RAISE]
+    assert not game.is_terminal(history)
+    assert game.stacks == [1, 0]
+    # The opponent is all-in, so there is nothing left to raise
+    assert game.valid_actions(history) == [PlayerAction.FOLD, PlayerAction.CALL]
+
+    history.append(CALL)
+    assert game.is_terminal(history)
+    assert game.street == SHOWDOWN
+    assert game.get_infoset_key(0, history) == 'AhAd|2c7d9hJs3s|rrc'
+    assert game.get_terminal_utility(history, 0) == 5
+    assert game.get_terminal_utility(history, 1) == -5
+
+
+def test_split_pot():
+    game = make_game(board=('As', 'Ks', 'Qs', 'Js', 'Ts'))
+    history = [CALL, CHECK, CHECK, CHECK, CHECK, CHECK, CHECK, CHECK]
+    assert game.is_terminal(history)
+    assert game.get_terminal_utility(history, 0) == 0
+    assert game.get_terminal_utility(history, 1) == 0
+
+
+def test_undo_restores_state():
+    game = make_game()
+    initial = (list(game.stacks), list(game.bets), game.pot, game.street, game.to_act, game.action_str)
+
+    history = [CALL, RAISE, CALL, RAISE]
+    game.is_terminal(history)
+    while game.actions:
+        game.undo()
+    assert (game.stacks, game.bets, game.pot, game.street, game.to_act, game.action_str) == initial
+
+
+def test_sync_follows_a_traversal():
+    # Moving to a sibling or a shorter history must give the same state as replaying it
+    game = make_game()
+    game.is_terminal([CALL, RAISE, RAISE])
+    game.is_terminal([CALL, RAISE, CALL, CHECK])
+    sibling = [CALL, RAISE, FOLD]
+
+    fresh = make_game()
+    for action in sibling:
+        fresh.apply(action)
+
+    assert game.get_infoset_key(0, sibling) == fresh.get_infoset_key(0, sibling)
+    assert game.actions == sibling
+    assert (game.stacks, game.bets, game.pot, game.street, game.to_act) == \
+        (fresh.stacks, fresh.bets, fresh.pot, fresh.street, fresh.to_act)
+
+
+def test_flop_order_does_not_change_the_key():
+    history = [CALL, CHECK, CHECK, CHECK]
+    keys = {
+        make_game(board=board).get_infoset_key(1, history)
+        for board in (('9h', '2c', '7d', 'Js', '3s'), ('7d', '9h', '2c', 'Js', '3s'), ('2c', '7d', '9h', 'Js', '3s'))
+    }
+    assert keys == {'KhKd|2c7d9hJs|ck/kk/'}
+
+    # The turn is not sorted into the flop
+    assert make_game(board=('9h', '7d', 'Js', '2c', '3s')).get_infoset_key(1, history) == 'KhKd|7d9hJs2c|ck/kk/'
@@ -0,0 +1,44 @@
+import pytest
+
+from src.game_v2 import KuhnPoker, PocketPoker
+from src.mccfr import MCCFR
+
+
+def test_zero_iterations_runs_nothing():
+    model = MCCFR(KuhnPoker, 4)
+    snapshots = list(model.train_iter(0))
+    assert len(snapshots) == 1
+    assert snapshots[0]['iterations_done'] == 0
+    assert snapshots[0]['stopped'] == 'iterations'
+    assert len(model.nodes) == 0
+
+
+def test_target_exploitability_needs_exact_or_supplied_deals():
+    model = MCCFR(PocketPoker, 4)
+    with pytest.raises(ValueError):
+        next(model.train_iter(10, target_exploitability=0.01))
+
+    model = MCCFR(KuhnPoker, 4)
+    snapshots = list(model.train_iter(5000, snapshot_every=500, target_exploitability=0.05))
+    assert snapshots[-1]['stopped'] == 'target'
+    assert snapshots[-1]['exploitability'] <= 0.05
+
+
+def test_warm_start_seeds_per_visit_regrets_and_average_strategy():
+    coarse = MCCFR(KuhnPoker, 4)
+    for _ in coarse.train_iter(200):
+        pass
+    coarse_key = 'K|'
+    source = coarse.nodes[coarse_key]
+
+    fine = MCCFR(KuhnPoker, 4)
+    fine.warm_start(coarse, lambda key: coarse_key if key == 'fine' else None, weight=10.0)
+    seeded = fine.get_infoset('fine', source.valid_action_indices)
+    unmapped = fine.get_infoset('other', source.valid_action_indices)
+
+    average = source.get_average_strategy()
+    for a in source.valid_action_indices:
+        assert seeded.regret_sum[a] == pytest.approx(source.regret_sum[a] / source.visited_count * 10.0)
+        assert seeded.strategy_sum[a] == pytest.approx(average[a] * 10.0)
+    assert seeded.get_average_strategy() == pytest.approx(average)
+    assert not unmapped.regret_sum.any() and not unmapped.strategy_sum.any()
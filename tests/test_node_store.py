@@ -0,0 +1,89 @@
+import pickle
+
+import numpy as np
+
+from src.game_v2 import KuhnPoker, PocketPoker
+from src.mccfr import Infoset, MCCFR
+from src.node_store import TieredNodeStore
+
+
+def train(model, iterations):
+    for _ in model.train_iter(iterations):
+        pass
+
+
+def test_tiny_capacity_matches_in_memory_training(tmp_path):
+    store = TieredNodeStore(str(tmp_path / 'nodes.sqlite'), capacity=20)
+    tiered = MCCFR(PocketPoker, 4, nodes=store)
+    plain = MCCFR(PocketPoker, 4)
+    train(tiered, 300)
+    train(plain, 300)
+
+    assert store.evictions > 0 and store.faults > 0
+    assert len(store) == len(plain.nodes)
+    assert sorted(store) == sorted(plain.nodes)
+    for key, infoset in plain.nodes.items():
+        assert np.array_equal(store[key].regret_sum, infoset.regret_sum)
+        assert np.array_equal(store[key].strategy_sum, infoset.strategy_sum)
+
+
+def test_file_size_stays_bounded(tmp_path):
+    store = TieredNodeStore(str(tmp_path / 'nodes.sqlite'), capacity=20)
+    model = MCCFR(PocketPoker, 4, nodes=store)
+
+    train(model, 400)
+    size = store.file_size()
+    written = store.bytes_written
+    train(model, 1600)
+
+    # Rewriting evicted rows must reuse their pages rather than grow the file
+    assert store.bytes_written - written > 5 * size
+    assert store.file_size() <= 1.5 * size
+
+
+def test_mapping_semantics(tmp_path):
+    store = TieredNodeStore(str(tmp_path / 'nodes.sqlite'), capacity=2, evict_fraction=0.5)
+    for i in range(5):
+        store[f"k{i}"] = Infoset(2, [0, 1])
+        store[f"k{i}"].visited_count = i
+    store.trim()
+
+    assert len(store.hot) == 1
+    assert len(store) == 5
+    assert sorted(store) == [f"k{i}" for i in range(5)]
+    assert 'k0' in store and 'missing' not in store
+    assert store.get('missing') is None
+
+    # A faulted-in entry shadows its row on disk until it is evicted again
+    store.get('k0').visited_count = 100
+    assert len(store) == 5
+    assert store['k0'].visited_count == 100
+
+    del store['k0']
+    assert 'k0' not in store
+    assert len(store) == 4
+
+
+def test_pickle_round_trip(tmp_path):
+    store = TieredNodeStore(str(tmp_path / 'nodes.sqlite'), capacity=4)
+    model = MCCFR(KuhnPoker, 4, nodes=store)
+    train(model, 200)
+    expected = {key: model.average_strategy(key) for key in model.nodes}
+
+    restored = pickle.loads(pickle.dumps(model))
+    assert isinstance(restored.nodes, TieredNodeStore)
+    assert len(restored.nodes) == len(expected)
+    for key, strategy in expected.items():
+        assert np.allclose(restored.average_strategy(key), strategy)
+
+
+def test_train_does_not_read_back_cold_entries(tmp_path, capsys):
+    quiet = TieredNodeStore(str(tmp_path / 'quiet.sqlite'), capacity=20)
+    train(MCCFR(PocketPoker, 4, nodes=quiet), 200)
+
+    store = TieredNodeStore(str(tmp_path / 'nodes.sqlite'), capacity=20)
+    MCCFR(PocketPoker, 4, nodes=store).train(200)
+
+    # Only the training itself faulted entries in; the summary didn't list the table
+    assert store.bytes_read == quiet.bytes_read
+    assert f"Infosets: {len(store)}" in capsys.readouterr().out
@@ -0,0 +1,67 @@
+import numpy as np
+
+from src.game_v2 import KuhnPoker
+from src.mccfr import Infoset, MCCFR
+from src.sharding import load_delta, merge_deltas, read_delta, read_delta_header, shard_range, train_shard, write_delta
+
+
+def model_with(infosets):
+    model = MCCFR(KuhnPoker, 4)
+    for key, (regret_sum, strategy_sum, visited_count) in infosets.items():
+        infoset = Infoset(4, [1, 3])
+        infoset.regret_sum[:] = regret_sum
+        infoset.strategy_sum[:] = strategy_sum
+        infoset.visited_count = visited_count
+        model.nodes[key] = infoset
+    return model
+
+
+def test_shard_ranges_cover_the_iterations():
+    ranges = [shard_range(10, 3, shard) for shard in range(3)]
+    assert ranges == [(1, 4), (5, 3), (8, 3)]
+
+
+def test_merge_sums_matching_keys_and_keeps_the_union(tmp_path):
+    a = model_with({'A|': ([0, 1, 0, 2], [0, 3, 0, 1], 4), 'K|': ([0, -1, 0, 1], [0, 1, 0, 1], 2)})
+    b = model_with({'K|': ([0, 2, 0, -3], [0, 2, 0, 2], 3), 'Q|': ([0, 5, 0, 5], [0, 1, 0, 0], 1)})
+    c = model_with({'A|': ([0, 1, 0, 1], [0, 1, 0, 1], 1)})
+    paths = [str(tmp_path / f"{name}.delta") for name in 'abc']
+    for model, path, iterations in zip((a, b, c), paths, (10, 20, 30)):
+        write_delta(model, path, iterations)
+
+    out = str(tmp_path / 'merged.delta')
+    merge_deltas(paths, out)
+
+    assert read_delta_header(out) == {'num_actions': 4, 'iterations': 60}
+    records = {key: rest for key, *rest in read_delta(out)}
+    assert list(records) == ['A|', 'K|', 'Q|']
+
+    _, regret_sum, strategy_sum, visited_count = records['A|']
+    assert np.array_equal(regret_sum, [0, 2, 0, 3])
+    assert np.array_equal(strategy_sum, [0, 4, 0, 2])
+    assert visited_count == 5
+
+    _, regret_sum, strategy_sum, visited_count = records['K|']
+    assert np.array_equal(regret_sum, [0, 1, 0, -2])
+    assert np.array_equal(strategy_sum, [0, 3, 0, 3])
+    assert visited_count == 5
+
+    # Merging must not modify the inputs
+    assert np.array_equal(next(read_delta(paths[0]))[2], [0, 1, 0, 2])
+
+
+def test_single_shard_round_trip_is_exact(tmp_path):
+    path = str(tmp_path / 'shard0.delta')
+    trained = train_shard(KuhnPoker, 4, 500, 1, 0, path)
+
+    out = str(tmp_path / 'merged.delta')
+    merge_deltas([path], out)
+    loaded = load_delta(out, KuhnPoker)
+
+    assert sorted(loaded.nodes) == sorted(trained.nodes)
+    for key, infoset in trained.nodes.items():
+        restored = loaded.nodes[key]
+        assert restored.valid_action_indices == infoset.valid_action_indices
+        assert np.array_equal(restored.regret_sum, infoset.regret_sum)
+        assert np.array_equal(restored.strategy_sum, infoset.strategy_sum)
+        assert restored.visited_count == infoset.visited_count